@@ -4,14 +4,31 @@ Handles connection to SQL Server using Windows Authentication
 """
 
 import os
+import sys
+import threading
+from pathlib import Path
+from urllib.parse import quote_plus
 import pyodbc
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.engine import URL
 
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
 # Load environment variables
 load_dotenv()
 
+# Let the ODBC driver manager reuse connections across pyodbc.connect calls
+# (must be set before the first connection is opened)
+pyodbc.pooling = True
+
+# Rows fetched per driver round-trip for cursors created by the engine
+CURSOR_ARRAYSIZE = 10_000
+
 class DatabaseConfig:
     """Configuration class for database connections"""
     
@@ -21,12 +38,26 @@ class DatabaseConfig:
         self.driver = os.getenv('SQL_DRIVER', 'ODBC Driver 17 for SQL Server')
         self.username = os.getenv('SQL_USERNAME', '')
         self.password = os.getenv('SQL_PASSWORD', '')
+        
+        # Connection string / URL, rebuilt only when the settings change
+        self._conn_settings = None
+        self._conn_str = None
+        self._connection_url = None
+        
+        # Shared engine (and connection pool), created on first use
+        self._engine = None
+        self._engine_lock = threading.Lock()
     
     def get_connection_string(self):
         """
         Generate connection string for pyodbc
         Uses Windows Authentication if username/password are empty
+        The string is cached and only rebuilt when a setting changes
         """
+        settings = (self.driver, self.server, self.database, self.username, self.password)
+        if settings == self._conn_settings:
+            return self._conn_str
+        
         if self.username and self.password:
             # SQL Server Authentication
             conn_str = (
@@ -44,8 +75,40 @@ class DatabaseConfig:
                 f"DATABASE={self.database};"
                 f"Trusted_Connection=yes;"
             )
+        
+        self._conn_str = conn_str
+        self._connection_url = URL.create(
+            "mssql+pyodbc",
+            query={"odbc_connect": conn_str}
+        )
+        self._conn_settings = settings
         return conn_str
     
+    def get_connection_url(self):
+        """
+        Return the SQLAlchemy URL matching get_connection_string
+        """
+        self.get_connection_string()
+        return self._connection_url
+    
+    def get_connectorx_uri(self):
+        """
+        Generate connection URI for connectorx
+        Uses Windows Authentication if username/password are empty
+        """
+        server = quote_plus(self.server)
+        database = quote_plus(self.database)
+        
+        if self.username and self.password:
+            # SQL Server Authentication
+            return (
+                f"mssql://{quote_plus(self.username)}:{quote_plus(self.password)}"
+                f"@{server}/{database}"
+            )
+        
+        # Windows Authentication
+        return f"mssql://{server}/{database}?trusted_connection=true"
+    
     def get_pyodbc_connection(self):
         """
         Create and return a pyodbc connection
@@ -58,36 +121,60 @@ class DatabaseConfig:
     
     def get_sqlalchemy_engine(self):
         """
-        Create and return a SQLAlchemy engine
-        Useful for pandas read_sql operations
+        Return the shared SQLAlchemy engine, creating it on first call
+        Useful for pandas read_sql operations; all callers share one
+        connection pool instead of paying a new handshake each time
         """
-        try:
-            connection_url = URL.create(
-                "mssql+pyodbc",
-                query={"odbc_connect": self.get_connection_string()}
-            )
-            engine = create_engine(connection_url)
-            return engine
-        except Exception as e:
-            raise Exception(f"Failed to create SQLAlchemy engine: {str(e)}")
+        if self._engine is not None:
+            return self._engine
+        
+        with self._engine_lock:
+            if self._engine is None:
+                try:
+                    self._engine = create_engine(
+                        self.get_connection_url(),
+                        pool_size=4,
+                        pool_pre_ping=True,
+                        fast_executemany=True
+                    )
+                    event.listen(self._engine, "before_cursor_execute", _set_cursor_arraysize)
+                except Exception as e:
+                    raise Exception(f"Failed to create SQLAlchemy engine: {str(e)}")
+        
+        return self._engine
+    
+    def reset_engine(self):
+        """
+        Dispose of the shared engine so the next call creates a fresh one
+        """
+        with self._engine_lock:
+            if self._engine is not None:
+                self._engine.dispose()
+                self._engine = None
     
     def test_connection(self):
         """
         Test the database connection
+        Runs on the shared engine, so the connection it opens goes back to
+        the pool and is reused by the extractors instead of a new handshake
         Returns True if successful, False otherwise
         """
         try:
-            conn = self.get_pyodbc_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-            conn.close()
+            with self.get_sqlalchemy_engine().connect() as conn:
+                conn.execute(text("SELECT 1"))
             return True
         except Exception as e:
-            print(f"Connection test failed: {str(e)}")
+            # Drop the cached engine so a later retry starts from scratch
+            self.reset_engine()
+            logger.error("Connection test failed: %s", e)
             return False
 
 
+def _set_cursor_arraysize(conn, cursor, statement, parameters, context, executemany):
+    """Fetch rows in large batches instead of pyodbc's default of one"""
+    cursor.arraysize = CURSOR_ARRAYSIZE
+
+
 # Create a singleton instance
 db_config = DatabaseConfig()
 
@@ -3,6 +3,10 @@ Main Pipeline Orchestrator
 Executes the complete ETL pipeline: Extract -> Transform -> Load
 """
 
+import asyncio
+import functools
+import logging
+import queue
 import sys
 from pathlib import Path
 from datetime import datetime
@@ -10,21 +14,30 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Phase modules (and pandas behind them) are imported inside the phases,
+# so a failed connection test aborts without paying their import cost
 from config.db_config import db_config
-from src.extract.extract_employees import EmployeeExtractor
-from src.extract.extract_departments import DepartmentExtractor
-from src.transform.transform_employees import EmployeeTransformer
-from src.load.load_to_gold import EmployeeAnalyticsLoader
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+_BAR = "=" * 60
+
 
 class DataPipeline:
     """Main pipeline orchestrator class"""
     
-    def __init__(self):
+    def __init__(self, concurrency_limit=2, filter_active=False):
+        """
+        Args:
+            concurrency_limit (int): Maximum number of independent
+                components (e.g. extractors) executed in parallel
+            filter_active (bool): Whether to keep active employees only
+        """
         self.pipeline_name = "Employee Data Pipeline"
+        self.concurrency_limit = concurrency_limit
+        self.filter_active = filter_active
+        self._semaphore = None
         self.start_time = None
         self.end_time = None
         self.status = "Not Started"
@@ -47,101 +60,169 @@ class DataPipeline:
                 logger.error("Database connection failed")
                 return False
         except Exception as e:
-            logger.error(f"Connection test error: {str(e)}")
+            logger.error("Connection test error: %s", e)
             return False
     
-    def extract_phase(self):
+    async def _run_blocking(self, func, *args, **kwargs):
+        """
+        Run a blocking call in a worker thread without blocking the event loop
+        At most concurrency_limit such calls run at the same time
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency_limit)
+        
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    
+    async def extract_phase(self, chunk_queue=None):
         """
         Execute extraction phase
         
+        Args:
+            chunk_queue (queue.Queue): Optional queue that receives employee
+                chunks as they are extracted; a None sentinel is always put
+                at the end, even on failure
+        
         Returns:
             bool: True if successful
         """
-        logger.info("\n" + "="*60)
+        logger.info("\n%s", _BAR)
         logger.info("PHASE 1: EXTRACTION")
-        logger.info("="*60)
+        logger.info(_BAR)
         
         try:
-            # Extract employees
-            employee_extractor = EmployeeExtractor()
-            emp_df, emp_file = employee_extractor.run()
-            logger.info(f"Employees extracted: {len(emp_df)} rows")
+            from src.extract.extract_employees import EmployeeExtractor
+            from src.extract.extract_departments import DepartmentExtractor
+            
+            # Employees and departments have no data dependency, so both
+            # I/O-bound extracts run concurrently. Wait for both before
+            # failing so no extractor is left writing to the queue.
+            emp_result, dept_result = await asyncio.gather(
+                self._run_blocking(
+                    EmployeeExtractor(chunk_queue=chunk_queue).run,
+                    filter_active=self.filter_active
+                ),
+                self._run_blocking(DepartmentExtractor().run),
+                return_exceptions=True
+            )
+            for result in (emp_result, dept_result):
+                if isinstance(result, Exception):
+                    raise result
             
-            # Extract departments
-            dept_extractor = DepartmentExtractor()
-            dept_df, dept_file = dept_extractor.run()
-            logger.info(f"Departments extracted: {len(dept_df)} rows")
+            emp_rows, emp_file = emp_result
+            dept_rows, dept_file = dept_result
             
-            logger.info("="*60)
+            logger.info("Employees extracted: %d rows", emp_rows)
+            logger.info("Departments extracted: %d rows", dept_rows)
+            
+            logger.info(_BAR)
             logger.info("EXTRACTION PHASE COMPLETED SUCCESSFULLY")
-            logger.info("="*60 + "\n")
+            logger.info("%s\n", _BAR)
             
             return True
             
         except Exception as e:
-            logger.error(f"Extraction phase failed: {str(e)}")
+            logger.error("Extraction phase failed: %s", e)
             self.errors.append(f"Extraction: {str(e)}")
             return False
+            
+        finally:
+            # End-of-stream sentinel for the transform stage
+            if chunk_queue is not None:
+                chunk_queue.put(None)
     
-    def transform_phase(self):
+    async def transform_phase(self, transformer=None, cleaned_future=None):
         """
         Execute transformation phase
         
+        Args:
+            transformer (EmployeeTransformer): Transformer to use
+            cleaned_future (asyncio.Future): Result of transformer.consume_chunks,
+                i.e. chunks cleaned while extraction was running
+        
         Returns:
             bool: True if successful
         """
-        logger.info("\n" + "="*60)
+        logger.info("\n%s", _BAR)
         logger.info("PHASE 2: TRANSFORMATION")
-        logger.info("="*60)
+        logger.info(_BAR)
         
         try:
             # Transform employees
-            transformer = EmployeeTransformer()
-            transformed_df, transformed_file = transformer.run(filter_active=False)
-            logger.info(f"Employees transformed: {len(transformed_df)} rows")
+            if transformer is None:
+                from src.transform.transform_employees import EmployeeTransformer
+                transformer = EmployeeTransformer()
+            cleaned_chunks = await cleaned_future if cleaned_future is not None else None
             
-            logger.info("="*60)
+            if cleaned_chunks:
+                transformed_df, transformed_file = await self._run_blocking(
+                    transformer.run,
+                    filter_active=self.filter_active,
+                    cleaned_chunks=cleaned_chunks
+                )
+                transformed_rows = len(transformed_df)
+            else:
+                # Nothing was streamed (e.g. the extract was cached), so
+                # transform the bronze file batch by batch
+                transformed_rows, transformed_file = await self._run_blocking(
+                    transformer.run_streaming,
+                    filter_active=self.filter_active
+                )
+            logger.info("Employees transformed: %d rows", transformed_rows)
+            
+            logger.info(_BAR)
             logger.info("TRANSFORMATION PHASE COMPLETED SUCCESSFULLY")
-            logger.info("="*60 + "\n")
+            logger.info("%s\n", _BAR)
             
             return True
             
         except Exception as e:
-            logger.error(f"Transformation phase failed: {str(e)}")
+            logger.error("Transformation phase failed: %s", e)
             self.errors.append(f"Transformation: {str(e)}")
             return False
     
-    def load_phase(self):
+    async def load_phase(self):
         """
         Execute load phase
         
         Returns:
             bool: True if successful
         """
-        logger.info("\n" + "="*60)
+        logger.info("\n%s", _BAR)
         logger.info("PHASE 3: LOAD TO GOLD LAYER")
-        logger.info("="*60)
+        logger.info(_BAR)
         
         try:
             # Load to gold layer
+            from src.load.load_to_gold import EmployeeAnalyticsLoader
             loader = EmployeeAnalyticsLoader()
-            saved_files, analytics = loader.run()
-            logger.info(f"Analytics tables created: {len(saved_files)}")
+            saved_files, analytics = await self._run_blocking(loader.run)
+            logger.info("Analytics tables created: %d", len(saved_files))
             
-            logger.info("="*60)
+            logger.info(_BAR)
             logger.info("LOAD PHASE COMPLETED SUCCESSFULLY")
-            logger.info("="*60 + "\n")
+            logger.info("%s\n", _BAR)
             
             return True
             
         except Exception as e:
-            logger.error(f"Load phase failed: {str(e)}")
+            logger.error("Load phase failed: %s", e)
             self.errors.append(f"Load: {str(e)}")
             return False
     
     def run(self):
         """
-        Execute the complete pipeline
+        Execute the complete pipeline (synchronous wrapper around run_async)
+        
+        Returns:
+            dict: Pipeline execution summary
+        """
+        return asyncio.run(self.run_async())
+    
+    async def run_async(self):
+        """
+        Execute the complete pipeline on the asyncio event loop
         
         Returns:
             dict: Pipeline execution summary
@@ -149,10 +230,11 @@ class DataPipeline:
         self.start_time = datetime.now()
         self.status = "Running"
         
-        logger.info("\n" + "="*60)
-        logger.info(f"STARTING PIPELINE: {self.pipeline_name}")
-        logger.info(f"Start Time: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        logger.info("="*60)
+        logger.info("\n%s", _BAR)
+        logger.info("STARTING PIPELINE: %s", self.pipeline_name)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Start Time: %s", self.start_time.strftime('%Y-%m-%d %H:%M:%S'))
+        logger.info(_BAR)
         
         # Test connection
         if not self.test_connection():
@@ -160,23 +242,42 @@ class DataPipeline:
             logger.error("Pipeline aborted: Database connection failed")
             return self.get_summary()
         
+        # Bound blocking work to concurrency_limit threads on this event loop
+        self._semaphore = asyncio.Semaphore(self.concurrency_limit)
+        
+        # Extract and transform overlap: employee chunks flow through a
+        # bounded queue and are cleaned while extraction is still running.
+        # The consumer gets its own thread, outside the concurrency limit,
+        # so it can never be starved by the extractors it is waiting on.
+        from src.transform.transform_employees import EmployeeTransformer
+        
+        chunk_queue = queue.Queue(maxsize=4)
+        transformer = EmployeeTransformer()
+        loop = asyncio.get_running_loop()
+        cleaned_future = loop.run_in_executor(
+            None, transformer.consume_chunks, chunk_queue, self.concurrency_limit
+        )
+        
         # Execute phases
         phases = [
-            ("Extract", self.extract_phase),
-            ("Transform", self.transform_phase),
+            ("Extract", lambda: self.extract_phase(chunk_queue)),
+            ("Transform", lambda: self.transform_phase(transformer, cleaned_future)),
             ("Load", self.load_phase)
         ]
         
         for phase_name, phase_func in phases:
-            success = phase_func()
+            success = await phase_func()
             
             if not success:
                 self.status = "Failed"
-                logger.error(f"Pipeline failed at {phase_name} phase")
+                logger.error("Pipeline failed at %s phase", phase_name)
                 break
         else:
             self.status = "Completed Successfully"
         
+        # The sentinel is always sent, so the consumer has finished by now
+        await asyncio.gather(cleaned_future, return_exceptions=True)
+        
         self.end_time = datetime.now()
         
         # Print summary
@@ -208,29 +309,29 @@ class DataPipeline:
         """Print pipeline execution summary"""
         summary = self.get_summary()
         
-        logger.info("\n" + "="*60)
+        logger.info("\n%s", _BAR)
         logger.info("PIPELINE EXECUTION SUMMARY")
-        logger.info("="*60)
-        logger.info(f"Pipeline Name: {summary['pipeline_name']}")
-        logger.info(f"Status: {summary['status']}")
+        logger.info(_BAR)
+        logger.info("Pipeline Name: %s", summary['pipeline_name'])
+        logger.info("Status: %s", summary['status'])
         
-        if summary['start_time']:
-            logger.info(f"Start Time: {summary['start_time'].strftime('%Y-%m-%d %H:%M:%S')}")
+        if summary['start_time'] and logger.isEnabledFor(logging.INFO):
+            logger.info("Start Time: %s", summary['start_time'].strftime('%Y-%m-%d %H:%M:%S'))
         
-        if summary['end_time']:
-            logger.info(f"End Time: {summary['end_time'].strftime('%Y-%m-%d %H:%M:%S')}")
+        if summary['end_time'] and logger.isEnabledFor(logging.INFO):
+            logger.info("End Time: %s", summary['end_time'].strftime('%Y-%m-%d %H:%M:%S'))
         
         if summary['duration_seconds']:
-            logger.info(f"Duration: {summary['duration_seconds']:.2f} seconds")
+            logger.info("Duration: %.2f seconds", summary['duration_seconds'])
         
         if summary['errors']:
             logger.info("\nErrors encountered:")
             for error in summary['errors']:
-                logger.info(f"  - {error}")
+                logger.info("  - %s", error)
         else:
             logger.info("\n No errors encountered")
         
-        logger.info("="*60 + "\n")
+        logger.info("%s\n", _BAR)
         
         # Print success message with emoji
         if summary['status'] == "Completed Successfully":
@@ -0,0 +1,110 @@
+"""
+Arrow Reader Module
+Streams SQL Server query results as Arrow tables without going through pandas
+"""
+
+import datetime
+import decimal
+import pyarrow as pa
+from pathlib import Path
+import sys
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.db_config import db_config
+
+# pyodbc reports the Python type of each column in cursor.description
+_ARROW_TYPES = {
+    bool: pa.bool_(),
+    int: pa.int64(),
+    float: pa.float64(),
+    str: pa.string(),
+    bytes: pa.binary(),
+    datetime.datetime: pa.timestamp('us'),
+    datetime.date: pa.date32(),
+    datetime.time: pa.time64('us')
+}
+
+
+def read_sql_batches(query, chunksize=50_000, params=None):
+    """
+    Execute a query and yield its result set as Arrow tables of chunksize rows
+
+    Rows are fetched with a streaming cursor and transposed straight into
+    Arrow columns, so no pandas DataFrame is built on the extract path.
+    Every chunk shares one schema derived from the cursor description, so
+    all-null columns in a chunk keep their real type. An empty result set
+    yields a single empty table, so the schema still reaches the writer.
+
+    Args:
+        query (str or TextClause): SQL query
+        chunksize (int): Number of rows fetched per chunk
+        params (dict): Optional bound parameters for the query
+
+    Yields:
+        pa.Table: Chunk of the result set
+    """
+    if isinstance(query, str):
+        query = text(query)
+
+    engine = db_config.get_sqlalchemy_engine()
+
+    with engine.connect() as conn:
+        result = conn.execution_options(yield_per=chunksize).execute(query, params or {})
+        schema = _schema_from_description(result.cursor.description)
+
+        empty = True
+        for rows in result.partitions(chunksize):
+            empty = False
+            columns = zip(*rows)
+            yield pa.table(
+                [_to_arrow(values, field.type) for values, field in zip(columns, schema)],
+                schema=schema
+            )
+
+        if empty:
+            yield schema.empty_table()
+
+
+def render_literal(query, params=None):
+    """
+    Render a parameterized text() query as plain SQL with the values inlined
+    For readers such as connectorx that cannot bind parameters
+
+    Args:
+        query (TextClause): SQL query with :name placeholders
+        params (dict): Values for the placeholders
+
+    Returns:
+        str: SQL query
+    """
+    if params:
+        query = query.bindparams(**params)
+
+    return str(query.compile(compile_kwargs={'literal_binds': True}))
+
+
+def _schema_from_description(description):
+    """Build an Arrow schema from a DB-API cursor description"""
+    fields = []
+    for name, type_code, *_ in description:
+        if type_code is decimal.Decimal:
+            # money/decimal columns are read as floats, as pandas.read_sql does
+            arrow_type = pa.float64()
+        else:
+            # Anything else (e.g. uniqueidentifier) is stored as text
+            arrow_type = _ARROW_TYPES.get(type_code, pa.string())
+        fields.append(pa.field(name, arrow_type))
+
+    return pa.schema(fields)
+
+
+def _to_arrow(values, arrow_type):
+    """Convert one column of Python values to an Arrow array"""
+    if pa.types.is_floating(arrow_type):
+        values = [None if value is None else float(value) for value in values]
+    elif pa.types.is_string(arrow_type):
+        values = [None if value is None else str(value) for value in values]
+
+    return pa.array(values, type=arrow_type)
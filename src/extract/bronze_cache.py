@@ -0,0 +1,63 @@
+"""
+Bronze Cache Module
+Skips re-extracting source tables that have not changed since the last run
+"""
+
+from pathlib import Path
+import sys
+from sqlalchemy import text
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.db_config import db_config
+from src.utils.cache import disk_memoize
+
+
+def table_fingerprint(extractor, *args, **kwargs):
+    """
+    Fingerprint the extractor's source table with a single aggregate query
+
+    Args:
+        extractor: Extractor instance (needs table_name)
+
+    Returns:
+        dict: Row count and checksum of the table plus the extract arguments
+    """
+    engine = db_config.get_sqlalchemy_engine()
+    query = text(
+        f"SELECT COUNT(*), CHECKSUM_AGG(BINARY_CHECKSUM(*)) FROM dbo.{extractor.table_name}"
+    )
+
+    with engine.connect() as conn:
+        row_count, checksum = conn.execute(query).one()
+
+    return {
+        'table': extractor.table_name,
+        'columns': getattr(extractor, 'COLUMNS', None),
+        'args': args,
+        'kwargs': kwargs,
+        'row_count': row_count,
+        'checksum': checksum
+    }
+
+
+def cache_sidecar(extractor, *args, **kwargs):
+    """Path of the sidecar file kept next to the latest bronze file"""
+    return extractor.output_dir / f"{extractor.table_name.lower()}_latest.cache.json"
+
+
+def bronze_files_exist(extractor, result):
+    """Check that the cached bronze file and its latest copy are still on disk"""
+    row_count, filepath = result
+    filepath = Path(filepath)
+    latest_filepath = extractor.output_dir / f"{extractor.table_name.lower()}_latest{filepath.suffix}"
+
+    return filepath.exists() and latest_filepath.exists()
+
+
+# Decorator for extractor run() methods returning (row_count, file_path)
+memoize_extract = disk_memoize(
+    key_fn=table_fingerprint,
+    sidecar_fn=cache_sidecar,
+    is_valid=bronze_files_exist
+)
@@ -10,132 +10,183 @@ from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
+from sqlalchemy import text
 from config.db_config import db_config
+from src.extract.arrow_reader import read_sql_batches
+from src.extract.bronze_cache import memoize_extract
 from src.utils.logger import get_logger
-from src.utils.data_quality import validate_dataframe
+from src.utils.data_quality import ChunkedQualityChecker
+from src.utils.storage import ChunkedWriter, link_latest
+
+try:
+    import connectorx as cx
+except ImportError:  # optional dependency, fall back to the pyodbc cursor
+    cx = None
 
 logger = get_logger(__name__)
 
+_BAR = "=" * 50
+
 
 class DepartmentExtractor:
     """Class to handle department group data extraction"""
     
+    # Built once so SQL Server can reuse the cached plan across runs
+    QUERY = text(
+        "SELECT DepartmentGroupKey, ParentDepartmentGroupKey, DepartmentGroupName "
+        "FROM dbo.DimDepartmentGroup"
+    )
+    
     def __init__(self):
         self.table_name = 'DimDepartmentGroup'
         self.output_dir = Path(__file__).parent.parent.parent / 'data' / 'bronze'
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.run_timestamp = None
     
-    def extract(self):
+    def extract(self, chunksize=50_000):
         """
-        Extract department group data from SQL Server
+        Extract department group data from SQL Server in chunks
         
-        Returns:
-            pd.DataFrame: Extracted department data
+        Args:
+            chunksize (int): Number of rows fetched per chunk
+        
+        Yields:
+            pa.Table: Chunk of extracted department data
         """
-        logger.info(f"Starting extraction of {self.table_name}")
+        logger.info("Starting extraction of %s", self.table_name)
         
         try:
-            # Get database engine
-            engine = db_config.get_sqlalchemy_engine()
-            
-            # SQL Query
-            query = f"""
-            SELECT 
-                DepartmentGroupKey,
-                ParentDepartmentGroupKey,
-                DepartmentGroupName
-            FROM dbo.{self.table_name}
-            """
-            
-            # Execute query
-            df = pd.read_sql(query, engine)
-            
-            logger.info(f"✅ Successfully extracted {len(df)} rows from {self.table_name}")
+            # Execute query straight into Arrow, with connectorx if available,
+            # otherwise stream the cursor chunk by chunk into Arrow tables
+            table = self._read_arrow(self.QUERY.text)
+            if table is not None:
+                chunks = [table]
+            else:
+                chunks = read_sql_batches(self.QUERY, chunksize=chunksize)
+            
+            # Quality stats are gathered per chunk (Arrow-backed view, no copy
+            # of the buffers) and the whole table is validated once at the end
+            checker = ChunkedQualityChecker(self.table_name)
+            
+            total_rows = 0
+            for chunk in chunks:
+                checker.update(chunk.to_pandas(types_mapper=pd.ArrowDtype))
+                
+                total_rows += len(chunk)
+                yield chunk
             
             # Validate data quality
-            validate_dataframe(df, self.table_name)
+            checker.run_all_checks()
             
-            return df
+            logger.info("✅ Successfully extracted %d rows from %s", total_rows, self.table_name)
             
         except Exception as e:
-            logger.error(f"❌ Failed to extract {self.table_name}: {str(e)}")
+            logger.error("❌ Failed to extract %s: %s", self.table_name, e)
             raise
     
-    def save_to_bronze(self, df):
+    def _read_arrow(self, query):
+        """
+        Read the query result directly into an Arrow table with connectorx
+        
+        Returns:
+            pa.Table: Query result, or None if connectorx is unavailable
+        """
+        if cx is None:
+            return None
+        
+        try:
+            return cx.read_sql(
+                db_config.get_connectorx_uri(),
+                query,
+                return_type='arrow'
+            )
+        except Exception as e:
+            logger.warning("⚠️  connectorx read failed, falling back to pyodbc: %s", e)
+            return None
+    
+    def save_to_bronze(self, chunks, file_format='parquet', ts=None):
         """
         Save extracted data to bronze layer
         
         Args:
-            df (pd.DataFrame): Data to save
+            chunks (iterable): Arrow table chunks to save
+            file_format (str): 'parquet' (Zstandard-compressed) or 'csv'
+            ts (datetime): Run timestamp used for both the file name and
+                the extraction metadata (defaults to now)
         
         Returns:
-            str: Path to saved file
+            tuple: (row_count, file_path)
         """
         try:
-            # Add extraction metadata
-            df['extraction_timestamp'] = datetime.now()
+            # One timestamp for the file name and the extraction metadata
+            extraction_timestamp = ts or datetime.now()
             
             # File path with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{self.table_name.lower()}_{timestamp}.csv"
+            timestamp = extraction_timestamp.strftime('%Y%m%d_%H%M%S')
+            filename = f"{self.table_name.lower()}_{timestamp}.{file_format}"
             filepath = self.output_dir / filename
             
             # Also save a "latest" version
-            latest_filepath = self.output_dir / f"{self.table_name.lower()}_latest.csv"
+            latest_filepath = self.output_dir / f"{self.table_name.lower()}_latest.{file_format}"
             
-            # Save files
-            df.to_csv(filepath, index=False)
-            df.to_csv(latest_filepath, index=False)
+            # Stream chunks into one file, then hard-link the latest version to it.
+            # Extraction metadata is stored once per file rather than per row
+            metadata = {'extraction_timestamp': extraction_timestamp.isoformat()}
+            with ChunkedWriter(filepath, file_format=file_format, metadata=metadata) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+            link_latest(filepath, latest_filepath)
             
-            logger.info(f"✅ Saved to bronze layer: {filepath}")
-            logger.info(f"✅ Saved latest version: {latest_filepath}")
+            logger.info("✅ Saved to bronze layer: %s", filepath)
+            logger.info("✅ Saved latest version: %s", latest_filepath)
             
-            return str(filepath)
+            return writer.rows_written, str(filepath)
             
         except Exception as e:
-            logger.error(f"❌ Failed to save to bronze layer: {str(e)}")
+            logger.error("❌ Failed to save to bronze layer: %s", e)
             raise
     
+    @memoize_extract
     def run(self):
         """
         Execute the complete extraction process
+        Skipped when the source table is unchanged since the last run
         
         Returns:
-            tuple: (DataFrame, file_path)
+            tuple: (row_count, file_path)
         """
-        logger.info("="*50)
-        logger.info(f"EXTRACTION STARTED: {self.table_name}")
-        logger.info("="*50)
+        logger.info(_BAR)
+        logger.info("EXTRACTION STARTED: %s", self.table_name)
+        logger.info(_BAR)
         
         try:
-            # Extract data
-            df = self.extract()
-            
-            # Save to bronze
-            filepath = self.save_to_bronze(df)
+            # Extract data and stream it to bronze without holding the full table
+            self.run_timestamp = datetime.now()
+            row_count, filepath = self.save_to_bronze(self.extract(), ts=self.run_timestamp)
             
-            logger.info("="*50)
-            logger.info(f"EXTRACTION COMPLETED: {self.table_name}")
-            logger.info(f"Rows extracted: {len(df)}")
-            logger.info(f"File saved: {filepath}")
-            logger.info("="*50)
+            logger.info(_BAR)
+            logger.info("EXTRACTION COMPLETED: %s", self.table_name)
+            logger.info("Rows extracted: %d", row_count)
+            logger.info("File saved: %s", filepath)
+            logger.info(_BAR)
             
-            return df, filepath
+            return row_count, filepath
             
         except Exception as e:
-            logger.error("="*50)
-            logger.error(f"EXTRACTION FAILED: {self.table_name}")
-            logger.error(f"Error: {str(e)}")
-            logger.error("="*50)
+            logger.error(_BAR)
+            logger.error("EXTRACTION FAILED: %s", self.table_name)
+            logger.error("Error: %s", e)
+            logger.error(_BAR)
             raise
 
 
 def main():
     """Main execution function"""
     extractor = DepartmentExtractor()
-    df, filepath = extractor.run()
+    row_count, filepath = extractor.run()
     
-    # Display data
+    # Display data read back from bronze
+    df = pd.read_parquet(filepath) if filepath.endswith('.parquet') else pd.read_csv(filepath)
     print("\n=== Department Groups ===")
     print(df)
     print(f"\n=== Data Shape: {df.shape} ===")
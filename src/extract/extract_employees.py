@@ -4,165 +4,361 @@ Extracts employee data from SQL Server to Bronze layer
 """
 
 import pandas as pd
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
+from sqlalchemy import text
 from config.db_config import db_config
+from src.extract.arrow_reader import read_sql_batches, render_literal
+from src.extract.bronze_cache import memoize_extract
 from src.utils.logger import get_logger
-from src.utils.data_quality import validate_dataframe
+from src.utils.data_quality import ChunkedQualityChecker
+from src.utils.storage import ChunkedWriter, link_latest
+
+try:
+    import connectorx as cx
+except ImportError:  # optional dependency, fall back to the pyodbc cursor
+    cx = None
 
 logger = get_logger(__name__)
 
+_BAR = "=" * 50
+
+# Marks the end of one key range in the partitioned read's hand-off queue
+_RANGE_DONE = object()
+
 
 class EmployeeExtractor:
     """Class to handle employee data extraction"""
     
-    def __init__(self):
+    # Columns referenced by EmployeeTransformer / EmployeeAnalyticsLoader
+    COLUMNS = [
+        'EmployeeKey',
+        'FirstName',
+        'LastName',
+        'MiddleName',
+        'Title',
+        'HireDate',
+        'BirthDate',
+        'EmailAddress',
+        'Phone',
+        'MaritalStatus',
+        'SalariedFlag',
+        'Gender',
+        'BaseRate',
+        'VacationHours',
+        'SickLeaveHours',
+        'CurrentFlag',
+        'SalesPersonFlag',
+        'DepartmentName',
+        'StartDate',
+        'EndDate'
+    ]
+    
+    # Numeric key the extract is split on, and number of parallel DB sessions
+    PARTITION_COLUMN = 'EmployeeKey'
+    PARTITION_NUM = 4
+    
+    # Statements are built once and parameterized, so SQL Server caches one
+    # plan per statement whatever the filter or key range. The server does
+    # the active-employee filtering when only_active = 1
+    QUERY = text(
+        f"SELECT {', '.join(COLUMNS)} "
+        "FROM dbo.DimEmployee "
+        "WHERE (:only_active = 0 OR CurrentFlag = 1)"
+    )
+    PARTITION_QUERY = text(
+        f"SELECT * FROM ({QUERY.text}) AS src "
+        f"WHERE {PARTITION_COLUMN} BETWEEN :low AND :high"
+    )
+    KEY_RANGE_QUERY = text(
+        f"SELECT MIN({PARTITION_COLUMN}), MAX({PARTITION_COLUMN}) FROM dbo.DimEmployee"
+    )
+    
+    def __init__(self, chunk_queue=None):
+        """
+        Args:
+            chunk_queue (queue.Queue): Optional queue that receives every
+                chunk once it is written to bronze, for downstream stages
+                running concurrently
+        """
         self.table_name = 'DimEmployee'
         self.output_dir = Path(__file__).parent.parent.parent / 'data' / 'bronze'
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.run_timestamp = None
+        self.chunk_queue = chunk_queue
     
-    def extract(self):
+    def extract(self, filter_active=False, chunksize=50_000):
         """
-        Extract employee data from SQL Server
+        Extract employee data from SQL Server in chunks
         
-        Returns:
-            pd.DataFrame: Extracted employee data
+        Args:
+            filter_active (bool): Whether to extract active employees only
+            chunksize (int): Number of rows fetched per chunk
+        
+        Yields:
+            pa.Table: Chunk of extracted employee data
         """
-        logger.info(f"Starting extraction of {self.table_name}")
+        logger.info("Starting extraction of %s", self.table_name)
         
         try:
-            # Get database engine
-            engine = db_config.get_sqlalchemy_engine()
-            
-            # SQL Query
-            query = f"""
-            SELECT 
-                EmployeeKey,
-                ParentEmployeeKey,
-                EmployeeNationalIDAlternateKey,
-                ParentEmployeeNationalIDAlternateKey,
-                SalesTerritoryKey,
-                FirstName,
-                LastName,
-                MiddleName,
-                NameStyle,
-                Title,
-                HireDate,
-                BirthDate,
-                LoginID,
-                EmailAddress,
-                Phone,
-                MaritalStatus,
-                EmergencyContactName,
-                EmergencyContactPhone,
-                SalariedFlag,
-                Gender,
-                PayFrequency,
-                BaseRate,
-                VacationHours,
-                SickLeaveHours,
-                CurrentFlag,
-                SalesPersonFlag,
-                DepartmentName,
-                StartDate,
-                EndDate,
-                Status
-            FROM dbo.{self.table_name}
-            """
-            
-            # Execute query
-            df = pd.read_sql(query, engine)
-            
-            logger.info(f"✅ Successfully extracted {len(df)} rows from {self.table_name}")
+            # SQL Query - project only the columns used downstream
+            params = {'only_active': int(filter_active)}
+            
+            # Execute query straight into Arrow, with connectorx if available,
+            # otherwise stream the cursor chunk by chunk into Arrow tables.
+            # Either way the key range is read by several sessions in parallel
+            key_range = self._get_key_range()
+            table = self._read_arrow(render_literal(self.QUERY, params), key_range)
+            if table is not None:
+                chunks = [table]
+            else:
+                chunks = self._read_partitioned(params, key_range, chunksize)
+            
+            # Quality stats are gathered per chunk (Arrow-backed view, no copy
+            # of the buffers) and the whole table is validated once at the end
+            checker = ChunkedQualityChecker(self.table_name)
+            
+            total_rows = 0
+            for chunk in chunks:
+                checker.update(chunk.to_pandas(types_mapper=pd.ArrowDtype))
+                
+                total_rows += len(chunk)
+                yield chunk
             
             # Validate data quality
-            validate_dataframe(df, self.table_name)
+            checker.run_all_checks()
             
-            return df
+            logger.info("✅ Successfully extracted %d rows from %s", total_rows, self.table_name)
             
         except Exception as e:
-            logger.error(f"❌ Failed to extract {self.table_name}: {str(e)}")
+            logger.error("❌ Failed to extract %s: %s", self.table_name, e)
             raise
     
-    def save_to_bronze(self, df):
+    def _get_key_range(self):
+        """
+        Get the bounds of the partition column with a single query
+        
+        Returns:
+            tuple: (min_key, max_key), or None if the table is empty
+        """
+        with db_config.get_sqlalchemy_engine().connect() as conn:
+            min_key, max_key = conn.execute(self.KEY_RANGE_QUERY).one()
+        
+        if min_key is None:
+            return None
+        return int(min_key), int(max_key)
+    
+    def _split_key_range(self, key_range):
+        """
+        Split (min_key, max_key) into PARTITION_NUM contiguous inclusive ranges
+        
+        Returns:
+            list: (low, high) tuples covering the whole key range
+        """
+        min_key, max_key = key_range
+        step = (max_key - min_key) // self.PARTITION_NUM + 1
+        
+        return [
+            (low, min(low + step - 1, max_key))
+            for low in range(min_key, max_key + 1, step)
+        ]
+    
+    def _read_partitioned(self, params, key_range, chunksize):
+        """
+        Read the query result over several pooled connections, one per key range
+        
+        Args:
+            params (dict): Bound parameters of QUERY
+            key_range (tuple): (min_key, max_key), or None to read in one go
+            chunksize (int): Number of rows fetched per chunk
+        
+        Yields:
+            pa.Table: Chunks of all key ranges, in arrival order
+        """
+        if key_range is None:
+            yield from read_sql_batches(self.QUERY, chunksize=chunksize, params=params)
+            return
+        
+        # Readers hand chunks over one at a time through a bounded queue and
+        # block while it is full, so peak memory stays near
+        # PARTITION_NUM x chunksize instead of the whole table
+        ranges = self._split_key_range(key_range)
+        chunk_queue = queue.Queue(maxsize=len(ranges))
+        stop = threading.Event()
+        
+        def hand_off(item):
+            # Give up once the consumer has stopped, instead of blocking forever
+            while not stop.is_set():
+                try:
+                    chunk_queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def read_range(bounds):
+            low, high = bounds
+            batches = read_sql_batches(
+                self.PARTITION_QUERY,
+                chunksize=chunksize,
+                params={**params, 'low': low, 'high': high}
+            )
+            try:
+                for table in batches:
+                    if not hand_off(table):
+                        return
+                hand_off(_RANGE_DONE)
+            except Exception as e:
+                hand_off(e)
+            finally:
+                batches.close()
+        
+        with ThreadPoolExecutor(max_workers=len(ranges), thread_name_prefix='extract') as executor:
+            for bounds in ranges:
+                executor.submit(read_range, bounds)
+            
+            try:
+                remaining = len(ranges)
+                while remaining:
+                    item = chunk_queue.get()
+                    if item is _RANGE_DONE:
+                        remaining -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                # Release readers still waiting on the queue (error or early close)
+                stop.set()
+    
+    def _read_arrow(self, query, key_range=None):
+        """
+        Read the query result directly into an Arrow table with connectorx
+        Partitioned on EmployeeKey so several DB sessions read in parallel
+        
+        Args:
+            query (str): SQL query
+            key_range (tuple): Known (min_key, max_key), saves connectorx
+                its own bounds query
+        
+        Returns:
+            pa.Table: Query result, or None if connectorx is unavailable
+        """
+        if cx is None:
+            return None
+        
+        try:
+            return cx.read_sql(
+                db_config.get_connectorx_uri(),
+                query,
+                return_type='arrow',
+                partition_on=self.PARTITION_COLUMN,
+                partition_range=key_range,
+                partition_num=self.PARTITION_NUM
+            )
+        except Exception as e:
+            logger.warning("⚠️  connectorx read failed, falling back to pyodbc: %s", e)
+            return None
+    
+    def save_to_bronze(self, chunks, file_format='parquet', ts=None):
         """
         Save extracted data to bronze layer
         
         Args:
-            df (pd.DataFrame): Data to save
+            chunks (iterable): Arrow table chunks to save
+            file_format (str): 'parquet' (Zstandard-compressed) or 'csv'
+            ts (datetime): Run timestamp used for both the file name and
+                the extraction metadata (defaults to now)
         
         Returns:
-            str: Path to saved file
+            tuple: (row_count, file_path)
         """
         try:
-            # Add extraction metadata
-            df['extraction_timestamp'] = datetime.now()
+            # One timestamp for the file name and the extraction metadata
+            extraction_timestamp = ts or datetime.now()
             
             # File path with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{self.table_name.lower()}_{timestamp}.csv"
+            timestamp = extraction_timestamp.strftime('%Y%m%d_%H%M%S')
+            filename = f"{self.table_name.lower()}_{timestamp}.{file_format}"
             filepath = self.output_dir / filename
             
             # Also save a "latest" version without timestamp
-            latest_filepath = self.output_dir / f"{self.table_name.lower()}_latest.csv"
+            latest_filepath = self.output_dir / f"{self.table_name.lower()}_latest.{file_format}"
             
-            # Save files
-            df.to_csv(filepath, index=False)
-            df.to_csv(latest_filepath, index=False)
+            # Stream chunks into one file, then hard-link the latest version to it.
+            # Extraction metadata is stored once per file rather than per row
+            metadata = {'extraction_timestamp': extraction_timestamp.isoformat()}
+            with ChunkedWriter(filepath, file_format=file_format, metadata=metadata) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+                    
+                    # Hand the chunk to the concurrent transform stage
+                    if self.chunk_queue is not None and len(chunk) > 0:
+                        self.chunk_queue.put(chunk)
+            link_latest(filepath, latest_filepath)
             
-            logger.info(f"✅ Saved to bronze layer: {filepath}")
-            logger.info(f"✅ Saved latest version: {latest_filepath}")
+            logger.info("✅ Saved to bronze layer: %s", filepath)
+            logger.info("✅ Saved latest version: %s", latest_filepath)
             
-            return str(filepath)
+            return writer.rows_written, str(filepath)
             
         except Exception as e:
-            logger.error(f"❌ Failed to save to bronze layer: {str(e)}")
+            logger.error("❌ Failed to save to bronze layer: %s", e)
             raise
     
-    def run(self):
+    @memoize_extract
+    def run(self, filter_active=False):
         """
         Execute the complete extraction process
+        Skipped when the source table is unchanged since the last run
+        
+        Args:
+            filter_active (bool): Whether to extract active employees only
         
         Returns:
-            tuple: (DataFrame, file_path)
+            tuple: (row_count, file_path)
         """
-        logger.info("="*50)
-        logger.info(f"EXTRACTION STARTED: {self.table_name}")
-        logger.info("="*50)
+        logger.info(_BAR)
+        logger.info("EXTRACTION STARTED: %s", self.table_name)
+        logger.info(_BAR)
         
         try:
-            # Extract data
-            df = self.extract()
-            
-            # Save to bronze
-            filepath = self.save_to_bronze(df)
+            # Extract data and stream it to bronze without holding the full table
+            self.run_timestamp = datetime.now()
+            row_count, filepath = self.save_to_bronze(
+                self.extract(filter_active=filter_active), ts=self.run_timestamp
+            )
             
-            logger.info("="*50)
-            logger.info(f"EXTRACTION COMPLETED: {self.table_name}")
-            logger.info(f"Rows extracted: {len(df)}")
-            logger.info(f"File saved: {filepath}")
-            logger.info("="*50)
+            logger.info(_BAR)
+            logger.info("EXTRACTION COMPLETED: %s", self.table_name)
+            logger.info("Rows extracted: %d", row_count)
+            logger.info("File saved: %s", filepath)
+            logger.info(_BAR)
             
-            return df, filepath
+            return row_count, filepath
             
         except Exception as e:
-            logger.error("="*50)
-            logger.error(f"EXTRACTION FAILED: {self.table_name}")
-            logger.error(f"Error: {str(e)}")
-            logger.error("="*50)
+            logger.error(_BAR)
+            logger.error("EXTRACTION FAILED: %s", self.table_name)
+            logger.error("Error: %s", e)
+            logger.error(_BAR)
             raise
 
 
 def main():
     """Main execution function"""
     extractor = EmployeeExtractor()
-    df, filepath = extractor.run()
+    row_count, filepath = extractor.run()
     
-    # Display sample data
+    # Display sample data read back from bronze
+    df = pd.read_parquet(filepath) if filepath.endswith('.parquet') else pd.read_csv(filepath)
     print("\n=== Sample Data (First 5 rows) ===")
     print(df.head())
     print(f"\n=== Data Shape: {df.shape} ===")
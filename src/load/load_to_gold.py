@@ -4,7 +4,10 @@ Aggregates employee data from Silver to Gold layer
 Creates business-ready analytics tables
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from pathlib import Path
 import sys
 from datetime import datetime
@@ -12,6 +15,12 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.utils.logger import get_logger
+from src.utils.storage import link_latest, write_csv
+
+try:
+    import polars as pl
+except ImportError:  # optional dependency, fall back to pandas groupby
+    pl = None
 
 logger = get_logger(__name__)
 
@@ -19,6 +28,34 @@ logger = get_logger(__name__)
 class EmployeeAnalyticsLoader:
     """Class to create analytics-ready employee data in Gold layer"""
     
+    # Tenure bands for the tenure analysis
+    TENURE_BINS = [-1, 1, 3, 5, 10, 100]
+    TENURE_LABELS = ['0-1 years', '1-3 years', '3-5 years', '5-10 years', '10+ years']
+    
+    # Narrow types for the silver columns the analytics read; integers that
+    # do not fit, or that have missing values, are left as they are
+    NARROW_DTYPES = {
+        'EmployeeKey': 'int32',
+        'Age': 'int8',
+        'YearsOfService': 'int8',
+        'VacationHours': 'int16',
+        'SickLeaveHours': 'int16'
+    }
+    CATEGORICAL_COLUMNS = ['DepartmentName', 'Gender', 'MaritalStatus']
+    
+    # Dimensions of the analytics cube and the measures averaged over them
+    CUBE_KEYS = ['DepartmentName', 'Gender', 'tenure_band', 'hire_year']
+    CUBE_MEASURES = {
+        'BaseRate': 'base_rate',
+        'YearsOfService': 'years_of_service',
+        'Age': 'age'
+    }
+    
+    # Without Polars, frames this large are aggregated by Dask across cores;
+    # below it the scheduling overhead outweighs the gain
+    DASK_MIN_ROWS = 500_000
+    DASK_PARTITIONS = 4
+    
     def __init__(self):
         self.silver_dir = Path(__file__).parent.parent.parent / 'data' / 'silver'
         self.gold_dir = Path(__file__).parent.parent.parent / 'data' / 'gold'
@@ -32,19 +69,30 @@ class EmployeeAnalyticsLoader:
             pd.DataFrame: Transformed employee data
         """
         try:
-            filepath = self.silver_dir / 'employees_latest.csv'
+            # Silver may be Parquet (default) or CSV; use the freshest one
+            candidates = [
+                self.silver_dir / 'employees_latest.parquet',
+                self.silver_dir / 'employees_latest.csv'
+            ]
+            existing = [path for path in candidates if path.exists()]
             
-            if not filepath.exists():
-                raise FileNotFoundError(f"Silver file not found: {filepath}")
+            if not existing:
+                raise FileNotFoundError(f"Silver file not found: {candidates[0]}")
             
-            df = pd.read_csv(filepath)
+            filepath = max(existing, key=lambda path: path.stat().st_mtime)
             
-            # Convert date columns back to datetime
-            date_columns = ['HireDate', 'BirthDate', 'StartDate', 'EndDate', 
-                          'transformation_timestamp']
-            for col in date_columns:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
+            if filepath.suffix == '.parquet':
+                # Parquet keeps the column types, dates included
+                df = pd.read_parquet(filepath, engine='pyarrow')
+            else:
+                df = pd.read_csv(filepath)
+                
+                # Convert date columns back to datetime
+                date_columns = ['HireDate', 'BirthDate', 'StartDate', 'EndDate', 
+                              'transformation_timestamp']
+                for col in date_columns:
+                    if col in df.columns:
+                        df[col] = pd.to_datetime(df[col], errors='coerce')
             
             logger.info(f"✅ Loaded {len(df)} rows from silver layer")
             
@@ -54,53 +102,278 @@ class EmployeeAnalyticsLoader:
             logger.error(f"❌ Failed to load from silver: {str(e)}")
             raise
     
-    def create_department_summary(self, df):
+    def downcast_dtypes(self, df):
+        """
+        Shrink numeric columns and turn grouping columns into categoricals
+        
+        Narrower columns mean fewer bytes scanned per aggregation, and
+        categorical keys are grouped on their integer codes.
+        
+        Args:
+            df (pd.DataFrame): Employee data
+        
+        Returns:
+            pd.DataFrame: Data with narrowed dtypes
+        """
+        dtypes = {}
+        
+        for col, dtype in self.NARROW_DTYPES.items():
+            if col not in df.columns:
+                continue
+            
+            values = df[col]
+            if values.dtype.kind == 'f':
+                # Age is float when some birth dates are missing
+                if values.isna().any() or not (values % 1 == 0).all():
+                    continue
+            elif values.dtype.kind not in 'iu':
+                continue
+            
+            limits = np.iinfo(dtype)
+            if values.min() >= limits.min and values.max() <= limits.max:
+                dtypes[col] = dtype
+        
+        for col in self.CATEGORICAL_COLUMNS:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                dtypes[col] = 'category'
+        
+        return df.astype(dtypes)
+    
+    def get_cube_keys(self, df):
+        """
+        Get the grouping keys of the analytics cube
+        
+        tenure_band and hire_year are derived as standalone Series and
+        passed to groupby directly, so the DataFrame is never copied or
+        modified to hold them.
+        
+        Args:
+            df (pd.DataFrame): Employee data
+        
+        Returns:
+            list: pd.Series keys named after the available CUBE_KEYS
+        """
+        keys = {
+            'DepartmentName': df.get('DepartmentName'),
+            'Gender': df.get('Gender')
+        }
+        
+        if 'YearsOfService' in df.columns:
+            keys['tenure_band'] = pd.cut(
+                df['YearsOfService'],
+                bins=self.TENURE_BINS,
+                labels=self.TENURE_LABELS
+            )
+        
+        if 'HireDate' in df.columns:
+            keys['hire_year'] = self._get_hire_year(df['HireDate'])
+        
+        return [
+            keys[name].rename(name)
+            for name in self.CUBE_KEYS
+            if keys.get(name) is not None
+        ]
+    
+    def _get_hire_year(self, hire_date):
+        """
+        Calendar year of each hire date, from a single datetime64[Y] cast
+        instead of the .dt accessor
+        
+        Args:
+            hire_date (pd.Series): datetime64 values
+        
+        Returns:
+            pd.Series: int16 years, or float64 with NaN where the date is missing
+        """
+        values = hire_date.to_numpy(dtype='datetime64[ns]')
+        years = values.astype('datetime64[Y]').view('i8') + 1970
+        
+        missing = np.isnat(values)
+        if missing.any():
+            years = np.where(missing, np.nan, years)
+        else:
+            years = years.astype(np.int16)
+        
+        return pd.Series(years, index=hire_date.index)
+    
+    def build_analytics_cube(self, df):
+        """
+        Aggregate the employee data once over every reporting dimension
+        
+        All analytics tables are rolled up from this cube, so the full
+        DataFrame is scanned by a single groupby. Means are kept as sums
+        and counts so they can be re-aggregated exactly.
+        
+        Args:
+            df (pd.DataFrame): Employee data
+        
+        Returns:
+            pd.DataFrame: Cube indexed by the available CUBE_KEYS
+        """
+        logger.info("Building analytics cube...")
+        
+        keys = self.get_cube_keys(df)
+        
+        aggregations = {'employee_count': ('EmployeeKey', 'count')}
+        for col, name in self.CUBE_MEASURES.items():
+            if col in df.columns:
+                aggregations[f'{name}_sum'] = (col, 'sum')
+                aggregations[f'{name}_count'] = (col, 'count')
+        if 'BaseRate' in df.columns:
+            aggregations['base_rate_min'] = ('BaseRate', 'min')
+            aggregations['base_rate_max'] = ('BaseRate', 'max')
+        
+        # Keep missing keys here; each report drops them when rolling up
+        if pl is not None:
+            cube = self._build_cube_polars(df, keys, aggregations)
+        else:
+            cube = None
+            if len(df) > self.DASK_MIN_ROWS:
+                cube = self._build_cube_dask(df, keys, aggregations)
+            if cube is None:
+                cube = df.groupby(keys, observed=True, dropna=False).agg(**aggregations)
+        
+        logger.info(f"✅ Built analytics cube with {len(cube)} cells")
+        
+        return cube
+    
+    def _get_cube_columns(self, df, keys, aggregations):
+        """
+        Collect the key and measure columns the cube needs, by name
+        
+        Returns:
+            dict: Column name -> pd.Series
+        """
+        columns = {key.name: key for key in keys}
+        for col, _ in aggregations.values():
+            columns.setdefault(col, df[col])
+        
+        return columns
+    
+    def _build_cube_dask(self, df, keys, aggregations):
+        """
+        Run the cube groupby on Dask, one partition per core
+        
+        Each partition is aggregated in parallel on the threaded scheduler
+        (pandas releases the GIL in its groupby kernels) and the partial
+        results are combined, with no data pickled between processes.
+        
+        Args:
+            df (pd.DataFrame): Employee data
+            keys (list): pd.Series grouping keys from get_cube_keys
+            aggregations (dict): Output name -> (column, 'sum'|'count'|'min'|'max')
+        
+        Returns:
+            pd.DataFrame: Same cube as the pandas groupby, or None if Dask
+                is not installed
+        """
+        # Imported here: only large frames without Polars need it, and the
+        # import alone costs a noticeable part of the pipeline's start-up
+        try:
+            import dask.dataframe as dd
+        except ImportError:  # optional dependency, fall back to pandas groupby
+            return None
+        
+        # Group categorical keys on their integer codes (-1 for missing):
+        # with dropna=False, pandas drops `ordered` from a categorical level
+        # in any partition holding a NaN group, and Dask then cannot combine
+        # the partial results
+        columns = self._get_cube_columns(df, keys, aggregations)
+        categorical_keys = [key for key in keys if isinstance(key.dtype, pd.CategoricalDtype)]
+        for key in categorical_keys:
+            columns[key.name] = key.cat.codes
+        
+        frame = dd.from_pandas(pd.DataFrame(columns), npartitions=self.DASK_PARTITIONS)
+        
+        cube = frame.groupby(
+            [key.name for key in keys], dropna=False
+        ).agg(**aggregations).compute(scheduler='threads').reset_index()
+        
+        # Restore the key dtypes, including category order and missing groups
+        for key in categorical_keys:
+            cube[key.name] = pd.Categorical.from_codes(cube[key.name], dtype=key.dtype)
+        
+        return cube.set_index([key.name for key in keys]).sort_index()
+    
+    def _build_cube_polars(self, df, keys, aggregations):
+        """
+        Run the cube groupby on Polars' multithreaded hash aggregation
+        
+        Args:
+            df (pd.DataFrame): Employee data
+            keys (list): pd.Series grouping keys from get_cube_keys
+            aggregations (dict): Output name -> (column, 'sum'|'count'|'min'|'max')
+        
+        Returns:
+            pd.DataFrame: Same cube as the pandas groupby
+        """
+        columns = self._get_cube_columns(df, keys, aggregations)
+        
+        # NaN becomes null, so sums, counts and min/max skip it as pandas does
+        frame = pl.DataFrame({name: pl.from_pandas(values) for name, values in columns.items()})
+        
+        exprs = []
+        for name, (col, func) in aggregations.items():
+            expr = getattr(pl.col(col), func)()
+            if func == 'count':
+                expr = expr.cast(pl.Int64)
+            exprs.append(expr.alias(name))
+        
+        cube = frame.lazy().group_by([key.name for key in keys]).agg(exprs).collect().to_pandas()
+        
+        # Restore the key dtypes; category order drives the report sort order
+        # and astype() ignores it for unordered categoricals
+        for key in keys:
+            if isinstance(key.dtype, pd.CategoricalDtype):
+                cube[key.name] = cube[key.name].astype('category').cat.set_categories(
+                    key.cat.categories, ordered=key.cat.ordered
+                )
+            else:
+                cube[key.name] = cube[key.name].astype(key.dtype)
+        
+        return cube.set_index([key.name for key in keys]).sort_index()
+    
+    def create_department_summary(self, df, cube=None):
         """
         Create department-level summary statistics
         
         Args:
             df (pd.DataFrame): Employee data
+            cube (pd.DataFrame): Optional result of build_analytics_cube
         
         Returns:
             pd.DataFrame: Department summary
         """
         logger.info("Creating department summary...")
         
-        summary = df.groupby('DepartmentName').agg({
-            'EmployeeKey': 'count',
-            'BaseRate': ['mean', 'median', 'min', 'max'],
-            'YearsOfService': 'mean',
-            'Age': 'mean',
-            'VacationHours': 'mean',
-            'SickLeaveHours': 'mean'
-        }).round(2)
-        
-        # Flatten column names
-        summary.columns = ['_'.join(col).strip() for col in summary.columns.values]
-        summary = summary.rename(columns={'EmployeeKey_count': 'total_employees'})
-        summary = summary.reset_index()
-        
-        # Calculate additional metrics
-        summary['avg_base_rate'] = summary['BaseRate_mean']
-        summary['avg_years_of_service'] = summary['YearsOfService_mean'].round(1)
-        summary['avg_age'] = summary['Age_mean'].round(1)
-        
-        # Keep only relevant columns
-        summary = summary[[
-            'DepartmentName', 'total_employees', 'avg_base_rate',
-            'avg_years_of_service', 'avg_age', 'BaseRate_min', 'BaseRate_max'
-        ]]
+        if cube is None:
+            cube = self.build_analytics_cube(df)
+        
+        by_dept = cube.groupby(level='DepartmentName', observed=True)
+        
+        def mean(name):
+            return (by_dept[f'{name}_sum'].sum() / by_dept[f'{name}_count'].sum()).round(2)
+        
+        summary = pd.DataFrame({
+            'total_employees': by_dept['employee_count'].sum(),
+            'avg_base_rate': mean('base_rate'),
+            'avg_years_of_service': mean('years_of_service').round(1),
+            'avg_age': mean('age').round(1),
+            'BaseRate_min': by_dept['base_rate_min'].min().round(2),
+            'BaseRate_max': by_dept['base_rate_max'].max().round(2)
+        }).reset_index()
         
         logger.info(f"✅ Created summary for {len(summary)} departments")
         
         return summary
     
-    def create_gender_diversity_report(self, df):
+    def create_gender_diversity_report(self, df, cube=None):
         """
         Create gender diversity analysis
         
         Args:
             df (pd.DataFrame): Employee data
+            cube (pd.DataFrame): Optional result of build_analytics_cube
         
         Returns:
             pd.DataFrame: Gender diversity report
@@ -111,29 +384,29 @@ class EmployeeAnalyticsLoader:
             logger.warning("Gender column not found, skipping diversity report")
             return None
         
-        diversity = df.groupby(['DepartmentName', 'Gender']).agg({
-            'EmployeeKey': 'count'
-        }).reset_index()
+        if cube is None:
+            cube = self.build_analytics_cube(df)
         
-        diversity = diversity.rename(columns={'EmployeeKey': 'employee_count'})
+        # Gender is categorical; only report the combinations that occur
+        diversity = cube.groupby(level=['DepartmentName', 'Gender'], observed=True)[
+            'employee_count'
+        ].sum().reset_index()
         
-        # Calculate percentages within each department
-        total_by_dept = diversity.groupby('DepartmentName')['employee_count'].sum()
-        diversity['percentage'] = diversity.apply(
-            lambda row: (row['employee_count'] / total_by_dept[row['DepartmentName']] * 100).round(2),
-            axis=1
-        )
+        # Calculate percentages within each department (vectorized)
+        total_by_dept = diversity.groupby('DepartmentName', observed=True)['employee_count'].transform('sum')
+        diversity['percentage'] = (diversity['employee_count'] / total_by_dept * 100).round(2)
         
         logger.info(f"✅ Created diversity report with {len(diversity)} records")
         
         return diversity
     
-    def create_tenure_analysis(self, df):
+    def create_tenure_analysis(self, df, cube=None):
         """
         Create employee tenure analysis
         
         Args:
             df (pd.DataFrame): Employee data
+            cube (pd.DataFrame): Optional result of build_analytics_cube
         
         Returns:
             pd.DataFrame: Tenure analysis
@@ -144,30 +417,33 @@ class EmployeeAnalyticsLoader:
             logger.warning("YearsOfService column not found, skipping tenure analysis")
             return None
         
-        # Create tenure bands
-        df_tenure = df.copy()
-        df_tenure['tenure_band'] = pd.cut(
-            df_tenure['YearsOfService'],
-            bins=[-1, 1, 3, 5, 10, 100],
-            labels=['0-1 years', '1-3 years', '3-5 years', '5-10 years', '10+ years']
-        )
-        
-        tenure_summary = df_tenure.groupby(['DepartmentName', 'tenure_band']).agg({
-            'EmployeeKey': 'count'
-        }).reset_index()
+        if cube is None:
+            cube = self.build_analytics_cube(df)
         
-        tenure_summary = tenure_summary.rename(columns={'EmployeeKey': 'employee_count'})
+        # Every department is reported with every tenure band, empty bands as 0
+        tenure_counts = cube.groupby(level=['DepartmentName', 'tenure_band'], observed=True)[
+            'employee_count'
+        ].sum()
+        departments = cube.index.get_level_values('DepartmentName').dropna().unique().sort_values()
+        bands = pd.CategoricalIndex(
+            self.TENURE_LABELS, categories=self.TENURE_LABELS, ordered=True
+        )
+        all_bands = pd.MultiIndex.from_product(
+            [departments, bands], names=['DepartmentName', 'tenure_band']
+        )
+        tenure_summary = tenure_counts.reindex(all_bands, fill_value=0).reset_index()
         
         logger.info(f"✅ Created tenure analysis with {len(tenure_summary)} records")
         
         return tenure_summary
     
-    def create_hiring_trends(self, df):
+    def create_hiring_trends(self, df, cube=None):
         """
         Create hiring trends by year
         
         Args:
             df (pd.DataFrame): Employee data
+            cube (pd.DataFrame): Optional result of build_analytics_cube
         
         Returns:
             pd.DataFrame: Hiring trends
@@ -178,44 +454,61 @@ class EmployeeAnalyticsLoader:
             logger.warning("HireDate column not found, skipping hiring trends")
             return None
         
-        df_hire = df.copy()
-        df_hire['hire_year'] = df_hire['HireDate'].dt.year
+        if cube is None:
+            cube = self.build_analytics_cube(df)
         
-        hiring_trends = df_hire.groupby(['hire_year', 'DepartmentName']).agg({
-            'EmployeeKey': 'count'
-        }).reset_index()
+        hiring_trends = cube.groupby(level=['hire_year', 'DepartmentName'], observed=True)[
+            'employee_count'
+        ].sum().reset_index()
         
-        hiring_trends = hiring_trends.rename(columns={'EmployeeKey': 'new_hires'})
+        hiring_trends = hiring_trends.rename(columns={'employee_count': 'new_hires'})
         hiring_trends = hiring_trends.sort_values(['hire_year', 'new_hires'], ascending=[False, False])
         
         logger.info(f"✅ Created hiring trends with {len(hiring_trends)} records")
         
         return hiring_trends
     
-    def save_to_gold(self, dataframes):
+    def save_to_gold(self, dataframes, file_format='parquet'):
         """
         Save all analytics tables to gold layer
         
+        Parquet tables are written to one dataset directory per table,
+        partitioned by run_date (data/gold/<name>/run_date=YYYY-MM-DD/).
+        A re-run on the same day replaces that day's partition. CSV tables
+        are written as timestamped files plus a "latest" link.
+        
         Args:
             dataframes (dict): Dictionary of dataframe name -> dataframe
+            file_format (str): 'parquet' (Zstandard-compressed) or 'csv'
         
         Returns:
-            dict: Paths to saved files
+            dict: Paths to saved files (dataset directories for Parquet)
         """
         saved_files = {}
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        now = datetime.now()
+        timestamp = now.strftime('%Y%m%d_%H%M%S')
+        run_date = now.strftime('%Y-%m-%d')
         
         for name, df in dataframes.items():
             if df is not None and not df.empty:
                 try:
-                    # Save with timestamp
-                    filename = f"{name}_{timestamp}.csv"
-                    filepath = self.gold_dir / filename
-                    df.to_csv(filepath, index=False)
-                    
-                    # Save latest version
-                    latest_filepath = self.gold_dir / f"{name}_latest.csv"
-                    df.to_csv(latest_filepath, index=False)
+                    if file_format == 'parquet':
+                        filepath = self.gold_dir / name
+                        pq.write_to_dataset(
+                            pa.Table.from_pandas(df.assign(run_date=run_date), preserve_index=False),
+                            root_path=filepath,
+                            partition_cols=['run_date'],
+                            basename_template=f"{name}-{{i}}.parquet",
+                            existing_data_behavior='delete_matching',
+                            compression='zstd'
+                        )
+                    else:
+                        # Save with timestamp
+                        filepath = self.gold_dir / f"{name}_{timestamp}.csv"
+                        write_csv(df, filepath)
+                        
+                        # Hard-link the latest version instead of writing it again
+                        link_latest(filepath, self.gold_dir / f"{name}_latest.csv")
                     
                     logger.info(f"✅ Saved {name} to gold layer: {filepath}")
                     saved_files[name] = str(filepath)
@@ -225,6 +518,43 @@ class EmployeeAnalyticsLoader:
         
         return saved_files
     
+    def load_from_gold(self, name, run_date=None):
+        """
+        Load one analytics table from the partitioned gold dataset
+        
+        Only the requested partition is read from disk.
+        
+        Args:
+            name (str): Table name (e.g. 'department_summary')
+            run_date (str): Partition to read as YYYY-MM-DD (defaults to latest)
+        
+        Returns:
+            pd.DataFrame: Analytics table
+        """
+        try:
+            dataset_dir = self.gold_dir / name
+            partitions = sorted(
+                path.name.split('=', 1)[1] for path in dataset_dir.glob('run_date=*')
+            )
+            
+            if not partitions:
+                raise FileNotFoundError(f"Gold dataset not found: {dataset_dir}")
+            
+            run_date = run_date or partitions[-1]
+            df = pd.read_parquet(
+                dataset_dir,
+                engine='pyarrow',
+                filters=[('run_date', '=', run_date)]
+            ).drop(columns='run_date')
+            
+            logger.info(f"✅ Loaded {len(df)} rows of {name} ({run_date}) from gold layer")
+            
+            return df
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to load {name} from gold: {str(e)}")
+            raise
+    
     def run(self):
         """
         Execute the complete load process
@@ -238,14 +568,17 @@ class EmployeeAnalyticsLoader:
         
         try:
             # Load from silver
-            df = self.load_from_silver()
+            df = self.downcast_dtypes(self.load_from_silver())
+            
+            # Aggregate once, then roll every analytics table up from the cube
+            cube = self.build_analytics_cube(df)
             
             # Create analytics tables
             analytics = {
-                'department_summary': self.create_department_summary(df),
-                'gender_diversity': self.create_gender_diversity_report(df),
-                'tenure_analysis': self.create_tenure_analysis(df),
-                'hiring_trends': self.create_hiring_trends(df)
+                'department_summary': self.create_department_summary(df, cube),
+                'gender_diversity': self.create_gender_diversity_report(df, cube),
+                'tenure_analysis': self.create_tenure_analysis(df, cube),
+                'hiring_trends': self.create_hiring_trends(df, cube)
             }
             
             # Save to gold
@@ -4,7 +4,13 @@ Transforms employee data from Bronze to Silver layer
 Performs data cleaning, type conversion, and standardization
 """
 
+import functools
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 import sys
 from datetime import datetime
@@ -12,10 +18,49 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from src.utils.logger import get_logger
-from src.utils.data_quality import validate_dataframe
+from src.utils.data_quality import ChunkedQualityChecker, validate_dataframe
+from src.utils.storage import ChunkedWriter, link_latest, write_csv
 
 logger = get_logger(__name__)
 
+# Length of the 365-day year used for Age / YearsOfService, in nanoseconds
+_NS_PER_YEAR = np.int64(365 * 24 * 3600 * 1_000_000_000)
+
+# int64 value of NaT, and the column length from which the compiled
+# kernel (if numba is installed) beats numpy's temporaries
+_NAT_NS = np.iinfo(np.int64).min
+_NUMBA_MIN_ROWS = 1_000_000
+
+# Column types of the bronze DimEmployee CSV, so dates and flags are
+# parsed once by the reader instead of being inferred and re-converted
+EMPLOYEE_SCHEMA = pa.schema([
+    ('EmployeeKey', pa.int64()),
+    ('FirstName', pa.string()),
+    ('LastName', pa.string()),
+    ('MiddleName', pa.string()),
+    ('Title', pa.string()),
+    ('HireDate', pa.timestamp('ns')),
+    ('BirthDate', pa.timestamp('ns')),
+    ('EmailAddress', pa.string()),
+    ('Phone', pa.string()),
+    ('MaritalStatus', pa.string()),
+    ('SalariedFlag', pa.bool_()),
+    ('Gender', pa.string()),
+    ('BaseRate', pa.float64()),
+    ('VacationHours', pa.int64()),
+    ('SickLeaveHours', pa.int64()),
+    ('CurrentFlag', pa.bool_()),
+    ('SalesPersonFlag', pa.bool_()),
+    ('DepartmentName', pa.string()),
+    ('StartDate', pa.timestamp('ns')),
+    ('EndDate', pa.timestamp('ns'))
+])
+
+_CSV_CONVERT_OPTIONS = pacsv.ConvertOptions(
+    column_types=EMPLOYEE_SCHEMA,
+    strings_can_be_null=True
+)
+
 
 class EmployeeTransformer:
     """Class to handle employee data transformation"""
@@ -25,6 +70,26 @@ class EmployeeTransformer:
         self.bronze_dir = Path(__file__).parent.parent.parent / 'data' / 'bronze'
         self.silver_dir = Path(__file__).parent.parent.parent / 'data' / 'silver'
         self.silver_dir.mkdir(parents=True, exist_ok=True)
+        self.run_timestamp = None
+    
+    def get_bronze_file(self):
+        """
+        Get the latest employee file in the bronze layer
+        Bronze may be Parquet (default) or CSV; the freshest one is used
+        
+        Returns:
+            Path: Bronze file
+        """
+        candidates = [
+            self.bronze_dir / 'dimemployee_latest.parquet',
+            self.bronze_dir / 'dimemployee_latest.csv'
+        ]
+        existing = [path for path in candidates if path.exists()]
+        
+        if not existing:
+            raise FileNotFoundError(f"Bronze file not found: {candidates[0]}")
+        
+        return max(existing, key=lambda path: path.stat().st_mtime)
     
     def load_from_bronze(self):
         """
@@ -34,12 +99,13 @@ class EmployeeTransformer:
             pd.DataFrame: Raw employee data
         """
         try:
-            filepath = self.bronze_dir / 'dimemployee_latest.csv'
+            filepath = self.get_bronze_file()
             
-            if not filepath.exists():
-                raise FileNotFoundError(f"Bronze file not found: {filepath}")
-            
-            df = pd.read_csv(filepath)
+            if filepath.suffix == '.parquet':
+                df = pd.read_parquet(filepath, engine='pyarrow', memory_map=True)
+            else:
+                # Multithreaded Arrow CSV parser with the column types declared up front
+                df = pacsv.read_csv(filepath, convert_options=_CSV_CONVERT_OPTIONS).to_pandas()
             logger.info(f"✅ Loaded {len(df)} rows from bronze layer")
             
             return df
@@ -48,12 +114,71 @@ class EmployeeTransformer:
             logger.error(f"❌ Failed to load from bronze: {str(e)}")
             raise
     
-    def clean_data(self, df):
+    def iter_bronze_batches(self, filepath, batch_size=200_000):
+        """
+        Read a bronze file batch by batch without loading it whole
+        
+        Args:
+            filepath (Path): Bronze Parquet or CSV file
+            batch_size (int): Rows per batch (Parquet); CSV batches are
+                read in blocks of a similar size
+        
+        Yields:
+            pd.DataFrame: Batch of raw employee data
+        """
+        if filepath.suffix == '.parquet':
+            reader = pq.ParquetFile(filepath, memory_map=True)
+            schema = reader.schema_arrow
+            batches = reader.iter_batches(batch_size=batch_size)
+        else:
+            batches = pacsv.open_csv(
+                filepath,
+                read_options=pacsv.ReadOptions(block_size=batch_size * 256),
+                convert_options=_CSV_CONVERT_OPTIONS
+            )
+            schema = batches.schema
+        
+        empty = True
+        for batch in batches:
+            empty = False
+            yield batch.to_pandas()
+        
+        # An empty bronze file still yields its (empty) columns, so silver
+        # gets a schema too
+        if empty:
+            yield schema.empty_table().to_pandas()
+    
+    def get_bronze_keep_mask(self, filepath):
+        """
+        Find the rows that survive de-duplication, reading only EmployeeKey
+        
+        Args:
+            filepath (Path): Bronze Parquet or CSV file
+        
+        Returns:
+            np.ndarray: True for the last row of every EmployeeKey
+        """
+        if filepath.suffix == '.parquet':
+            keys = pq.read_table(filepath, columns=['EmployeeKey'], memory_map=True)
+        else:
+            keys = pacsv.read_csv(
+                filepath,
+                convert_options=pacsv.ConvertOptions(
+                    column_types=EMPLOYEE_SCHEMA,
+                    include_columns=['EmployeeKey']
+                )
+            )
+        
+        return ~keys.column('EmployeeKey').to_pandas().duplicated(keep='last').to_numpy()
+    
+    def clean_data(self, df, now=None):
         """
         Clean and standardize employee data
         
         Args:
             df (pd.DataFrame): Raw data
+            now (pd.Timestamp): Reference time for Age / YearsOfService
+                (defaults to now)
         
         Returns:
             pd.DataFrame: Cleaned data
@@ -76,12 +201,16 @@ class EmployeeTransformer:
         
         for col in text_columns:
             if col in df_clean.columns:
-                df_clean[col] = df_clean[col].astype(str).str.strip()
+                # Arrow-backed strings: strip runs as an Arrow kernel and
+                # missing values stay missing (not the string 'nan'), so a
+                # missing DepartmentName now counts against data_quality_score
+                df_clean[col] = df_clean[col].astype('string[pyarrow]').str.strip()
         
-        # 4. Create full name field
+        # 4. Create full name field (vectorized, the middle name only when present)
+        middle_name = df_clean['MiddleName']
         df_clean['FullName'] = (
             df_clean['FirstName'] + ' ' + 
-            df_clean['MiddleName'].apply(lambda x: x + ' ' if x else '') + 
+            (middle_name + ' ').where(middle_name.str.len() > 0, '') + 
             df_clean['LastName']
         ).str.strip()
         
@@ -92,13 +221,12 @@ class EmployeeTransformer:
                 df_clean[col] = pd.to_datetime(df_clean[col], errors='coerce')
         
         # 6. Calculate derived fields
+        today_ns = np.int64(pd.Timestamp(now or pd.Timestamp.now()).value)
         if 'BirthDate' in df_clean.columns:
-            today = pd.Timestamp.now()
-            df_clean['Age'] = (today - df_clean['BirthDate']).dt.days // 365
+            df_clean['Age'] = _years_since(df_clean['BirthDate'], today_ns)
         
         if 'HireDate' in df_clean.columns:
-            today = pd.Timestamp.now()
-            df_clean['YearsOfService'] = (today - df_clean['HireDate']).dt.days // 365
+            df_clean['YearsOfService'] = _years_since(df_clean['HireDate'], today_ns)
         
         # 7. Standardize boolean fields
         boolean_columns = ['SalariedFlag', 'CurrentFlag', 'SalesPersonFlag']
@@ -112,28 +240,81 @@ class EmployeeTransformer:
             if col in df_clean.columns:
                 df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce').fillna(0)
         
-        # 9. Standardize gender and marital status
+        # 9. Standardize gender and marital status as 1-byte categorical codes
+        # (categories in sorted order so reports sort as before; unknown
+        # codes become missing)
         if 'Gender' in df_clean.columns:
-            gender_map = {'M': 'Male', 'F': 'Female'}
-            df_clean['Gender'] = df_clean['Gender'].map(gender_map)
+            gender_codes = df_clean['Gender'].map({'F': 0, 'M': 1}).fillna(-1).astype('int8')
+            df_clean['Gender'] = pd.Categorical.from_codes(
+                gender_codes, categories=['Female', 'Male']
+            )
         
         if 'MaritalStatus' in df_clean.columns:
-            marital_map = {'M': 'Married', 'S': 'Single'}
-            df_clean['MaritalStatus'] = df_clean['MaritalStatus'].map(marital_map)
-        
-        # 10. Add data quality flag
-        df_clean['data_quality_score'] = 100
+            marital_codes = df_clean['MaritalStatus'].map({'M': 0, 'S': 1}).fillna(-1).astype('int8')
+            df_clean['MaritalStatus'] = pd.Categorical.from_codes(
+                marital_codes, categories=['Married', 'Single']
+            )
         
-        # Reduce score for missing critical fields
+        # 10. Add data quality flag, 10 points off per missing critical
+        # field, counted in one pass over the critical columns
         critical_fields = ['EmailAddress', 'Phone', 'DepartmentName']
-        for field in critical_fields:
-            if field in df_clean.columns:
-                df_clean.loc[df_clean[field].isna(), 'data_quality_score'] -= 10
+        missing = df_clean[[f for f in critical_fields if f in df_clean.columns]].isna().to_numpy()
+        df_clean['data_quality_score'] = (100 - 10 * missing.sum(axis=1)).astype('int8')
         
         logger.info("✅ Data cleaning completed")
         
         return df_clean
     
+    def transform_chunk(self, chunk, now=None):
+        """
+        Clean a single chunk of raw employee data
+        
+        Args:
+            chunk (pd.DataFrame or pa.Table): Raw chunk from the extractor
+            now (pd.Timestamp): Reference time passed to clean_data
+        
+        Returns:
+            pd.DataFrame: Cleaned chunk
+        """
+        if isinstance(chunk, pa.Table):
+            chunk = chunk.to_pandas()
+        
+        return self.clean_data(chunk, now=now)
+    
+    def consume_chunks(self, chunk_queue, concurrency_limit=2):
+        """
+        Clean raw chunks from a queue while the extractor is still producing them
+        
+        Args:
+            chunk_queue (queue.Queue): Raw chunks, terminated by a None sentinel
+            concurrency_limit (int): Maximum number of chunks cleaned in parallel
+        
+        Returns:
+            list: Cleaned chunks in arrival order (empty if nothing was streamed)
+        """
+        # One reference time for every chunk of this run
+        self.run_timestamp = pd.Timestamp.now()
+        futures = []
+        pending = set()
+        
+        with ThreadPoolExecutor(max_workers=concurrency_limit) as executor:
+            while True:
+                # At most concurrency_limit chunks in flight: while they are
+                # all busy nothing is taken off the bounded queue, so a slow
+                # transform blocks the extractor's put instead of raw chunks
+                # piling up in the executor
+                if len(pending) >= concurrency_limit:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                
+                chunk = chunk_queue.get()
+                if chunk is None:
+                    break
+                future = executor.submit(self.transform_chunk, chunk, self.run_timestamp)
+                futures.append(future)
+                pending.add(future)
+        
+        return [future.result() for future in futures]
+    
     def remove_duplicates(self, df):
         """
         Remove duplicate records
@@ -144,17 +325,18 @@ class EmployeeTransformer:
         Returns:
             pd.DataFrame: Deduplicated data
         """
-        initial_count = len(df)
+        # Primary keys are normally unique already: skip the copy
+        if df['EmployeeKey'].is_unique:
+            logger.info("✅ No duplicates found")
+            return df
         
-        # Remove duplicates based on EmployeeKey
-        df_dedup = df.drop_duplicates(subset=['EmployeeKey'], keep='last')
+        # Remove duplicates based on EmployeeKey, keeping the last record
+        # (take() returns a new frame, not a slice flagged for copy warnings)
+        keep_mask = ~df['EmployeeKey'].duplicated(keep='last').to_numpy()
+        df_dedup = df.take(np.flatnonzero(keep_mask))
         
-        removed_count = initial_count - len(df_dedup)
-        
-        if removed_count > 0:
-            logger.warning(f"⚠️  Removed {removed_count} duplicate records")
-        else:
-            logger.info("✅ No duplicates found")
+        removed_count = len(df) - len(df_dedup)
+        logger.warning(f"⚠️  Removed {removed_count} duplicate records")
         
         return df_dedup
     
@@ -176,31 +358,32 @@ class EmployeeTransformer:
             logger.warning("CurrentFlag column not found, skipping active filter")
             return df
     
-    def save_to_silver(self, df):
+    def save_to_silver(self, df, file_format='parquet', ts=None):
         """
         Save transformed data to silver layer
         
         Args:
             df (pd.DataFrame): Transformed data
+            file_format (str): 'parquet' (Zstandard-compressed) or 'csv'
+            ts (datetime): Run timestamp used for both the file name and
+                the transformation metadata (defaults to now)
         
         Returns:
             str: Path to saved file
         """
         try:
             # Add transformation metadata
-            df['transformation_timestamp'] = datetime.now()
-            
-            # File path with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{self.table_name}_{timestamp}.csv"
-            filepath = self.silver_dir / filename
+            transformation_timestamp = ts or datetime.now()
+            df['transformation_timestamp'] = transformation_timestamp
             
-            # Also save a "latest" version
-            latest_filepath = self.silver_dir / f"{self.table_name}_latest.csv"
+            filepath, latest_filepath = self._get_silver_paths(file_format, transformation_timestamp)
             
-            # Save files
-            df.to_csv(filepath, index=False)
-            df.to_csv(latest_filepath, index=False)
+            # Save once, then hard-link the latest version to it
+            if file_format == 'parquet':
+                df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
+            else:
+                write_csv(df, filepath)
+            link_latest(filepath, latest_filepath)
             
             logger.info(f"✅ Saved to silver layer: {filepath}")
             logger.info(f"✅ Saved latest version: {latest_filepath}")
@@ -211,12 +394,109 @@ class EmployeeTransformer:
             logger.error(f"❌ Failed to save to silver layer: {str(e)}")
             raise
     
-    def run(self, filter_active=False):
+    def _get_silver_paths(self, file_format, ts):
+        """
+        Get the timestamped and "latest" silver file paths
+        
+        Returns:
+            tuple: (file_path, latest_file_path)
+        """
+        filename = f"{self.table_name}_{ts.strftime('%Y%m%d_%H%M%S')}.{file_format}"
+        
+        return (
+            self.silver_dir / filename,
+            self.silver_dir / f"{self.table_name}_latest.{file_format}"
+        )
+    
+    def run_streaming(self, filter_active=False, batch_size=200_000):
+        """
+        Transform bronze to silver batch by batch, with flat memory use
+        
+        Each bronze batch is cleaned and appended to the silver Parquet
+        file as a row group, so the full table is never held in memory.
+        Duplicates are resolved up front from the EmployeeKey column alone.
+        
+        Args:
+            filter_active (bool): Whether to filter for active employees only
+            batch_size (int): Number of bronze rows processed at a time
+        
+        Returns:
+            tuple: (row_count, file_path)
+        """
+        logger.info("="*50)
+        logger.info(f"TRANSFORMATION STARTED: {self.table_name} (streaming)")
+        logger.info("="*50)
+        
+        try:
+            bronze_file = self.get_bronze_file()
+            
+            # Remove duplicates (keep the last row per EmployeeKey)
+            keep = self.get_bronze_keep_mask(bronze_file)
+            removed_count = int((~keep).sum())
+            if removed_count > 0:
+                logger.warning(f"⚠️  Removed {removed_count} duplicate records")
+            else:
+                logger.info("✅ No duplicates found")
+            
+            # One timestamp for the ages, the file name and the metadata
+            self.run_timestamp = pd.Timestamp.now()
+            filepath, latest_filepath = self._get_silver_paths('parquet', self.run_timestamp)
+            
+            # Quality stats are gathered per batch and checked once at the end
+            checker = ChunkedQualityChecker(self.table_name)
+            
+            offset = 0
+            with ChunkedWriter(filepath) as writer:
+                for batch in self.iter_bronze_batches(bronze_file, batch_size=batch_size):
+                    batch_keep = keep[offset:offset + len(batch)]
+                    offset += len(batch)
+                    
+                    df_clean = self.clean_data(batch[batch_keep], now=self.run_timestamp)
+                    
+                    # Optional: Filter active employees
+                    if filter_active:
+                        df_clean = self.filter_active_employees(df_clean)
+                    
+                    # Every batch must share one Parquet schema, whether or
+                    # not it has missing dates
+                    df_clean = df_clean.astype({
+                        col: 'float64' for col in ('Age', 'YearsOfService')
+                        if col in df_clean.columns
+                    })
+                    
+                    checker.update(df_clean)
+                    
+                    df_clean['transformation_timestamp'] = self.run_timestamp
+                    writer.write(df_clean)
+            
+            # Validate quality
+            checker.run_all_checks()
+            link_latest(filepath, latest_filepath)
+            
+            logger.info("="*50)
+            logger.info(f"TRANSFORMATION COMPLETED: {self.table_name}")
+            logger.info(f"Input rows: {offset}")
+            logger.info(f"Output rows: {writer.rows_written}")
+            logger.info(f"File saved: {filepath}")
+            logger.info("="*50)
+            
+            return writer.rows_written, str(filepath)
+            
+        except Exception as e:
+            logger.error("="*50)
+            logger.error(f"TRANSFORMATION FAILED: {self.table_name}")
+            logger.error(f"Error: {str(e)}")
+            logger.error("="*50)
+            raise
+    
+    def run(self, filter_active=False, cleaned_chunks=None):
         """
         Execute the complete transformation process
         
         Args:
             filter_active (bool): Whether to filter for active employees only
+            cleaned_chunks (list): Chunks already cleaned by consume_chunks;
+                when empty or None the data is loaded from bronze instead
         
         Returns:
             tuple: (DataFrame, file_path)
@@ -226,11 +506,19 @@ class EmployeeTransformer:
         logger.info("="*50)
         
         try:
-            # Load from bronze
-            df = self.load_from_bronze()
-            
-            # Clean data
-            df_clean = self.clean_data(df)
+            if cleaned_chunks:
+                # Chunks were cleaned while extraction was running, as of
+                # the run timestamp taken by consume_chunks
+                df_clean = pd.concat(cleaned_chunks, ignore_index=True)
+                df = df_clean
+            else:
+                self.run_timestamp = pd.Timestamp.now()
+                
+                # Load from bronze
+                df = self.load_from_bronze()
+                
+                # Clean data
+                df_clean = self.clean_data(df, now=self.run_timestamp)
             
             # Remove duplicates
             df_dedup = self.remove_duplicates(df_clean)
@@ -245,7 +533,7 @@ class EmployeeTransformer:
             validate_dataframe(df_final, self.table_name)
             
             # Save to silver
-            filepath = self.save_to_silver(df_final)
+            filepath = self.save_to_silver(df_final, ts=self.run_timestamp)
             
             logger.info("="*50)
             logger.info(f"TRANSFORMATION COMPLETED: {self.table_name}")
@@ -264,6 +552,67 @@ class EmployeeTransformer:
             raise
 
 
+@functools.lru_cache(maxsize=None)
+def _get_years_since_kernel():
+    """
+    Compile the parallel Age / YearsOfService kernel on first use
+    numba is imported here, so runs that never reach _NUMBA_MIN_ROWS rows
+    do not pay for importing it
+    
+    Returns:
+        function: kernel(values, today_ns, out) -> number of missing dates,
+            or None if numba is not installed
+    """
+    try:
+        import numba
+    except ImportError:  # optional dependency, fall back to numpy
+        return None
+    
+    @numba.njit(parallel=True, cache=True)
+    def kernel(values, today_ns, out):
+        # Whole years since each int64 nanosecond value (NaN for NaT) in one pass
+        missing = 0
+        for i in numba.prange(values.shape[0]):
+            if values[i] == _NAT_NS:
+                out[i] = np.nan
+                missing += 1
+            else:
+                out[i] = (today_ns - values[i]) // _NS_PER_YEAR
+        return missing
+    
+    return kernel
+
+
+def _years_since(dates, today_ns):
+    """
+    Whole 365-day years from each date to today, computed on the int64
+    nanosecond values instead of through a Timedelta Series
+    
+    Args:
+        dates (pd.Series): datetime64 values
+        today_ns (np.int64): Current time in nanoseconds since the epoch
+    
+    Returns:
+        np.ndarray: int64 years, or float64 with NaN where the date is missing
+    """
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    
+    kernel = _get_years_since_kernel() if len(values) >= _NUMBA_MIN_ROWS else None
+    if kernel is not None:
+        years = np.empty(len(values), dtype=np.float64)
+        if kernel(values.view('i8'), today_ns, years):
+            return years
+        return years.astype(np.int64)
+    
+    years = (today_ns - values.view('i8')) // _NS_PER_YEAR
+    
+    missing = np.isnat(values)
+    if missing.any():
+        years = np.where(missing, np.nan, years)
+    
+    return years
+
+
 def main():
     """Main execution function"""
     transformer = EmployeeTransformer()
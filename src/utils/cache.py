@@ -0,0 +1,80 @@
+"""
+Cache Utility Module
+Disk-backed memoization for expensive, idempotent pipeline steps
+"""
+
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def disk_memoize(key_fn, sidecar_fn, is_valid=None):
+    """
+    Memoize a method's JSON-serializable result in a sidecar file
+
+    The wrapped method only runs when the fingerprint returned by key_fn
+    differs from the one stored in the sidecar. Delete the sidecar to
+    force a re-run.
+
+    Args:
+        key_fn (callable): key_fn(self, *args, **kwargs) -> JSON-serializable
+            fingerprint of the source data
+        sidecar_fn (callable): sidecar_fn(self, *args, **kwargs) -> path of
+            the sidecar file
+        is_valid (callable): Optional is_valid(self, result) -> bool, used to
+            reject a cached result whose outputs no longer exist
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            fingerprint = json.dumps(key_fn(self, *args, **kwargs), sort_keys=True, default=str)
+            key = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+            sidecar = Path(sidecar_fn(self, *args, **kwargs))
+
+            cached = _read_sidecar(sidecar)
+            if cached is not None and cached.get('key') == key:
+                result = cached['result']
+                if isinstance(result, list):
+                    result = tuple(result)
+
+                if is_valid is None or is_valid(self, result):
+                    logger.info("✅ Cache hit for %s: %s", func.__qualname__, sidecar)
+                    return result
+
+            result = func(self, *args, **kwargs)
+            _write_sidecar(sidecar, {'key': key, 'result': result})
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _read_sidecar(sidecar):
+    """Return the sidecar contents, or None if missing or unreadable"""
+    try:
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_sidecar(sidecar, payload):
+    """Atomically replace the sidecar with the given payload"""
+    tmp_path = sidecar.with_name(sidecar.name + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, default=str)
+    os.replace(tmp_path, sidecar)
@@ -3,6 +3,7 @@ Data Quality Checker Module
 Validates data quality at each pipeline stage
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import sys
@@ -21,15 +22,31 @@ class DataQualityChecker:
         self.df = dataframe
         self.table_name = table_name
         self.issues = []
+        self._row_count = None
+        self._dtypes = None
+        self._null_by_col = None
+        self._dup_count = None
+    
+    def _compute_stats(self):
+        """
+        Scan the dataframe once for the null and duplicate counts
+        shared by the checks and the summary
+        """
+        if self._dup_count is None:
+            self._row_count = len(self.df)
+            self._dtypes = self.df.dtypes
+            self._null_by_col = self.df.isnull().sum()
+            self._dup_count = self.df.duplicated().sum()
     
     def check_null_values(self):
         """Check for null values in the dataframe"""
-        null_counts = self.df.isnull().sum()
+        self._compute_stats()
+        null_counts = self._null_by_col
         null_columns = null_counts[null_counts > 0]
         
         if not null_columns.empty:
             for col, count in null_columns.items():
-                percentage = (count / len(self.df)) * 100
+                percentage = (count / self._row_count) * 100
                 message = f"Column '{col}' has {count} null values ({percentage:.2f}%)"
                 self.issues.append(message)
                 logger.warning(f"[{self.table_name}] {message}")
@@ -38,7 +55,8 @@ class DataQualityChecker:
     
     def check_duplicates(self):
         """Check for duplicate rows"""
-        duplicate_count = self.df.duplicated().sum()
+        self._compute_stats()
+        duplicate_count = self._dup_count
         
         if duplicate_count > 0:
             message = f"Found {duplicate_count} duplicate rows"
@@ -49,7 +67,8 @@ class DataQualityChecker:
     
     def check_row_count(self, expected_min=1):
         """Check if dataframe has minimum expected rows"""
-        row_count = len(self.df)
+        self._compute_stats()
+        row_count = self._row_count
         
         if row_count < expected_min:
             message = f"Row count ({row_count}) is below expected minimum ({expected_min})"
@@ -62,8 +81,9 @@ class DataQualityChecker:
     
     def check_data_types(self):
         """Log data types of all columns"""
+        self._compute_stats()
         logger.info(f"[{self.table_name}] Data types:")
-        for col, dtype in self.df.dtypes.items():
+        for col, dtype in self._dtypes.items():
             logger.info(f"  - {col}: {dtype}")
     
     def run_all_checks(self):
@@ -86,16 +106,63 @@ class DataQualityChecker:
     
     def get_summary(self):
         """Return a summary dictionary"""
+        self._compute_stats()
         return {
             'table': self.table_name,
-            'row_count': len(self.df),
-            'column_count': len(self.df.columns),
-            'null_count': self.df.isnull().sum().sum(),
-            'duplicate_count': self.df.duplicated().sum(),
+            'row_count': self._row_count,
+            'column_count': len(self._dtypes),
+            'null_count': self._null_by_col.sum(),
+            'duplicate_count': self._dup_count,
             'issues': self.issues
         }
 
 
+class ChunkedQualityChecker(DataQualityChecker):
+    """
+    Data quality checks over a table that arrives in chunks
+    
+    Row, null and duplicate counts are accumulated chunk by chunk (rows
+    are kept only as 8-byte hashes), so the checks run once for the
+    whole table, duplicates across chunks included, without holding it
+    in memory.
+    """
+    
+    def __init__(self, table_name):
+        super().__init__(None, table_name)
+        self._row_count = 0
+        self._row_hashes = []
+    
+    def update(self, chunk):
+        """
+        Add a chunk to the running statistics
+        
+        Args:
+            chunk (pd.DataFrame): Next rows of the table
+        """
+        null_counts = chunk.isnull().sum()
+        if self._dtypes is None:
+            self._dtypes = chunk.dtypes
+            self._null_by_col = null_counts
+        else:
+            self._null_by_col = self._null_by_col + null_counts
+        
+        self._row_count += len(chunk)
+        self._row_hashes.append(pd.util.hash_pandas_object(chunk, index=False).to_numpy())
+    
+    def _compute_stats(self):
+        """Finish the duplicate count from the row hashes of all chunks"""
+        if self._dup_count is not None:
+            return
+        
+        if self._dtypes is None:
+            self._dtypes = pd.Series(dtype=object)
+            self._null_by_col = pd.Series(dtype='int64')
+        
+        hashes = np.concatenate(self._row_hashes) if self._row_hashes else np.empty(0, dtype=np.uint64)
+        self._dup_count = self._row_count - len(np.unique(hashes))
+        self._row_hashes = []
+
+
 def validate_dataframe(df, table_name):
     """
     Convenience function to validate a dataframe
@@ -3,6 +3,7 @@ Logging Utility Module
 Provides consistent logging configuration across the pipeline
 """
 
+import functools
 import logging
 import os
 from datetime import datetime
@@ -15,6 +16,10 @@ class PipelineLogger:
         self.logger = logging.getLogger(name)
         self.logger.setLevel(log_level)
         
+        # Already configured: skip building handlers (and opening the log file)
+        if self.logger.handlers:
+            return
+        
         # Create logs directory if it doesn't exist
         log_dir = Path(__file__).parent.parent.parent / 'logs'
         log_dir.mkdir(exist_ok=True)
@@ -39,19 +44,19 @@ class PipelineLogger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
-        # Add handlers if not already added
-        if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-            self.logger.addHandler(console_handler)
+        self.logger.addHandler(file_handler)
+        self.logger.addHandler(console_handler)
     
     def get_logger(self):
         """Return the configured logger"""
         return self.logger
 
 
+@functools.lru_cache(maxsize=None)
 def get_logger(name):
     """
     Convenience function to get a logger
+    Cached per name, so each logger is configured once per process
     
     Args:
         name (str): Name of the logger (usually __name__)
@@ -0,0 +1,210 @@
+"""
+Storage Utility Module
+Helpers for writing pipeline layers to disk
+"""
+
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+from pathlib import Path
+import sys
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Shared by all writers so disk writes overlap with the next database fetch
+_WRITE_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix='chunk-writer')
+
+
+class ChunkedWriter:
+    """
+    Append DataFrame chunks to a single Parquet or CSV file
+
+    The underlying writer is opened lazily on the first chunk so the file
+    schema (Parquet) or header (CSV) comes from the data itself.
+
+    Each chunk is encoded and written on a background thread, so the
+    caller can fetch the next chunk while the previous one is being
+    written. At most one write per file is in flight, which keeps chunks
+    in order and memory bounded to two chunks. Both formats are encoded
+    by Arrow's C++ writers, which release the GIL, so writes of several
+    files run truly in parallel.
+
+    File-level metadata (e.g. the extraction timestamp) is stored once
+    instead of as a column: in the Parquet schema for Parquet files, and
+    in a "<file>.meta.json" sidecar for CSV files.
+    """
+
+    def __init__(self, filepath, file_format='parquet', compression='zstd', metadata=None):
+        if file_format not in ('parquet', 'csv'):
+            raise ValueError(f"Unsupported file format: {file_format}")
+
+        self.filepath = Path(filepath)
+        self.file_format = file_format
+        self.compression = compression
+        self.metadata = {key: str(value) for key, value in (metadata or {}).items()}
+        self.rows_written = 0
+        self._writer = None
+        self._schema = None
+        self._pending = None
+
+    def write(self, chunk):
+        """
+        Queue a chunk to be appended to the file
+
+        Errors from a background write are raised by the next write() or
+        by close().
+
+        Args:
+            chunk (pd.DataFrame or pa.Table): Rows to append
+        """
+        self._wait()
+
+        self._pending = _WRITE_EXECUTOR.submit(self._write_chunk, chunk)
+        self.rows_written += len(chunk)
+
+    def _wait(self):
+        """Block until the in-flight write (if any) has finished"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            pending.result()
+
+    def _write_chunk(self, chunk):
+        """Convert a chunk to Arrow (if needed) and append it (runs on the writer thread)"""
+        if self._writer is None:
+            if isinstance(chunk, pa.Table):
+                table = chunk
+            else:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+
+            # All-null columns infer as the Arrow null type, which would
+            # reject real values in later chunks; widen them to string
+            self._schema = pa.schema([
+                field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                for field in table.schema
+            ], metadata={**(table.schema.metadata or {}), **self.metadata})
+            table = table.cast(self._schema)
+            if self.file_format == 'parquet':
+                self._writer = pq.ParquetWriter(
+                    self.filepath, self._schema, compression=self.compression
+                )
+            else:
+                # Header is written once, when the writer is opened
+                self._writer = pacsv.CSVWriter(self.filepath, self._schema)
+        elif isinstance(chunk, pa.Table):
+            table = chunk.cast(self._schema)
+        else:
+            table = pa.Table.from_pandas(chunk, schema=self._schema, preserve_index=False)
+
+        self._writer.write_table(table)
+
+    def close(self):
+        """Flush and close the file, creating an empty one if nothing was written"""
+        try:
+            self._wait()
+            self._close_file()
+        except BaseException:
+            self.abort()
+            raise
+
+    def abort(self):
+        """
+        Stop writing and delete the partial file, so a failed stream never
+        leaves a truncated but readable file behind
+        """
+        try:
+            self._wait()
+        except Exception:
+            pass
+
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+            self._writer = None
+
+        self.filepath.unlink(missing_ok=True)
+
+    def _close_file(self):
+        """Close the underlying writer and write any metadata sidecar"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        elif self.rows_written == 0 and not self.filepath.exists():
+            if self.file_format == 'parquet':
+                pq.write_table(pa.table({}).replace_schema_metadata(self.metadata), self.filepath)
+            else:
+                self.filepath.touch()
+
+        if self.file_format == 'csv' and self.metadata:
+            with open(metadata_path(self.filepath), 'w', encoding='utf-8') as f:
+                json.dump(self.metadata, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+def write_csv(df, filepath):
+    """
+    Write a DataFrame to CSV with Arrow's multithreaded C++ writer
+
+    Much faster than DataFrame.to_csv, which formats every cell in Python.
+
+    Args:
+        df (pd.DataFrame): Data to write (the index is not written)
+        filepath (str or Path): Destination file
+    """
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), str(filepath))
+
+
+def metadata_path(filepath):
+    """Path of the JSON metadata sidecar for a CSV file"""
+    filepath = Path(filepath)
+    return filepath.with_name(filepath.name + '.meta.json')
+
+
+def link_latest(filepath, latest_filepath):
+    """
+    Point the "latest" file at a freshly written file without copying data
+
+    A hard link is created under a temporary name and swapped in with
+    os.replace, so readers never see a missing or half-written latest
+    file. Falls back to a byte copy where hard links are unsupported
+    (e.g. FAT volumes or some network shares). A metadata sidecar next
+    to the file, if any, is linked alongside it.
+
+    Args:
+        filepath (str or Path): File that was just written
+        latest_filepath (str or Path): Stable "latest" path to update
+    """
+    filepath = Path(filepath)
+    latest_filepath = Path(latest_filepath)
+    tmp_filepath = latest_filepath.with_name(latest_filepath.name + '.tmp')
+
+    if tmp_filepath.exists():
+        tmp_filepath.unlink()
+
+    try:
+        os.link(filepath, tmp_filepath)
+    except OSError:
+        shutil.copyfile(filepath, tmp_filepath)
+
+    os.replace(tmp_filepath, latest_filepath)
+
+    if metadata_path(filepath).exists():
+        link_latest(metadata_path(filepath), metadata_path(latest_filepath))